@@ -0,0 +1 @@
+"""Micro-benchmarks for the helpers in ``utils/``. Run them from the repository root."""
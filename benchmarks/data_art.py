@@ -0,0 +1,33 @@
+"""Compare the payload of the Data Art chart path with the raster PNG.
+
+Usage: python -m benchmarks.data_art [points ...]
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.search_index import timed
+from utils.data_art import ART_STYLES, art_points, render_art
+
+WIDTH, HEIGHT = 1024, 768
+
+
+def chart_payload(style, n):
+    # Roughly what st.scatter_chart would serialize: one JSON record per point
+    x, y, _ = art_points(style, n, np.random.default_rng(0))
+    return len(pd.DataFrame({'X': x, 'Y': y}).to_json(orient='records'))
+
+
+def main(sizes):
+    print(f"{'style':>15} {'points':>12} {'render':>10} {'PNG KB':>8} {'JSON KB':>10}")
+    for style in ART_STYLES:
+        for points in sizes:
+            seconds, png = timed(render_art, style, points, 'Ocean', WIDTH, HEIGHT, seed=0)
+            json_kb = chart_payload(style, points) / 1024
+            print(f"{style:>15} {points:>12,} {seconds * 1000:>8.1f}ms {len(png) / 1024:>8.0f} {json_kb:>10,.0f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
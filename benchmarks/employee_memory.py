@@ -0,0 +1,44 @@
+"""Bytes per employee for the original object-column roster vs. the compact layout.
+
+Usage: python -m benchmarks.employee_memory [rows ...]
+"""
+
+import sys
+
+import numpy as np
+
+from benchmarks.search_index import make_roster
+from utils.employee_schema import COLUMNS, DEPARTMENTS, STATUSES, to_compact
+
+
+def make_employees(rows, seed=0):
+    # The layout the roster used to have: Python objects in every text and date column
+    rng = np.random.default_rng(seed)
+    df = make_roster(rows, seed).astype(object)
+    df['department'] = np.array(DEPARTMENTS, dtype=object)[rng.integers(len(DEPARTMENTS), size=rows)]
+    df['salary'] = rng.integers(30_000, 200_000, size=rows)
+    days = rng.integers(0, 20 * 365, size=rows)
+    df['hire_date'] = (np.datetime64('2005-01-01') + days).astype(object)
+    df['status'] = np.array(STATUSES, dtype=object)[rng.integers(len(STATUSES), size=rows)]
+    return df[COLUMNS]
+
+
+def per_row(df):
+    usage = df.memory_usage(deep=True, index=False)
+    return usage / len(df), usage.sum() / len(df)
+
+
+def main(sizes):
+    for rows in sizes:
+        before = make_employees(rows)
+        after = to_compact(before)
+        (before_cols, before_total), (after_cols, after_total) = per_row(before), per_row(after)
+        print(f"\n{rows:,} rows - {before_total:.1f} -> {after_total:.1f} bytes per employee "
+              f"({before_total / after_total:.1f}x smaller)")
+        print(f"{'column':>12} {'before':>10} {'after':>10} {'dtype':>24}")
+        for col in COLUMNS:
+            print(f"{col:>12} {before_cols[col]:>10.1f} {after_cols[col]:>10.1f} {str(after[col].dtype):>24}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
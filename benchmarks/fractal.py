@@ -0,0 +1,32 @@
+"""Time the tiled Mandelbrot renderer: cold, coarse preview, after a pan and fully cached.
+
+Usage: python -m benchmarks.fractal [max_iter ...]
+"""
+
+import sys
+import time
+
+from utils.fractal import COARSE_STEP, HOME, FractalRenderer, scale_at
+
+WIDTH, HEIGHT = 1024, 768
+
+
+def main(iterations):
+    renderer = FractalRenderer()
+    # Start the worker processes before timing anything
+    renderer.render("Mandelbrot set", None, (10.0, 10.0), 0, 1, 1, 1)
+    print(f"{renderer.workers} worker process(es)")
+    print(f"{'max_iter':>9} {'preview':>10} {'cold':>10} {'pan':>10} {'cached':>10}")
+    for max_iter in iterations:
+        center = HOME["Mandelbrot set"]
+        panned = (center[0] + 0.25 * WIDTH * scale_at(0), center[1])
+        timings = []
+        for view, step in [(center, COARSE_STEP), (center, 1), (panned, 1), (panned, 1)]:
+            start = time.perf_counter()
+            renderer.render("Mandelbrot set", None, view, 0, WIDTH, HEIGHT, max_iter, step)
+            timings.append(time.perf_counter() - start)
+        print(f"{max_iter:>9,}" + "".join(f"{t * 1000:>8.1f}ms" for t in timings))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [100, 500, 2000])
@@ -0,0 +1,30 @@
+"""Track Monte Carlo random-walk throughput, in-process and over worker processes.
+
+Usage: python -m benchmarks.monte_carlo [walks ...]
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from utils.monte_carlo import simulate_walks
+
+STEPS = 500
+
+
+def main(sizes):
+    with ProcessPoolExecutor(os.cpu_count() or 1, mp_context=get_context("spawn")) as pool:
+        simulate_walks(1, 1, executor=pool)  # start the workers before timing
+        print(f"{STEPS} steps per walk, {os.cpu_count()} worker process(es)")
+        print(f"{'walks':>12} {'in-process':>18} {'workers':>18}")
+        for walks in sizes:
+            rates = []
+            for executor in (None, pool):
+                _, seconds = simulate_walks(walks, STEPS, seed=0, executor=executor)
+                rates.append(f"{walks * STEPS / seconds / 1e6:>10.1f}M steps/s")
+            print(f"{walks:>12,} {rates[0]:>18} {rates[1]:>18}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000])
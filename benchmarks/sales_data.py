@@ -0,0 +1,47 @@
+"""Time the vectorized sales generator against the original per-row version.
+
+Usage: python -m benchmarks.sales_data [rows ...]
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from benchmarks.search_index import timed
+from utils.sales_data import generate_sales
+
+# The per-row version is skipped above this size: it is slow, and one day per row
+# runs past datetime's year 1 minimum at around 740,000 rows
+LEGACY_MAX_ROWS = 100_000
+
+
+def legacy_sales(n_points):
+    # The page's original generator: one datetime and one random call per row and column
+    dates = [datetime.now() - timedelta(days=x) for x in range(n_points, 0, -1)]
+    return pd.DataFrame({
+        'Date': dates,
+        'Sales': [random.randint(1000, 5000) + i * 10 for i in range(n_points)],
+        'Profit': [random.randint(200, 1000) + i * 5 for i in range(n_points)],
+        'Customers': [random.randint(50, 200) + i * 2 for i in range(n_points)],
+        'Region': [random.choice(['North', 'South', 'East', 'West']) for _ in range(n_points)]
+    })
+
+
+def main(sizes):
+    print(f"{'rows':>12} {'per-row':>10} {'vectorized':>12} {'speedup':>8} {'MB':>8}")
+    for rows in sizes:
+        fast, df = timed(generate_sales, rows, 0)
+        if rows <= LEGACY_MAX_ROWS:
+            slow, _ = timed(legacy_sales, rows, repeat=1)
+            legacy = f"{slow * 1000:>8.1f}ms"
+            speedup = f"{slow / fast:>7.1f}x"
+        else:
+            legacy, speedup = f"{'-':>10}", f"{'-':>8}"
+        size = df.memory_usage(deep=True).sum() / 1e6
+        print(f"{rows:>12,} {legacy} {fast * 1000:>10.1f}ms {speedup} {size:>8.1f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000, 1_000_000, 5_000_000])
@@ -0,0 +1,47 @@
+"""Time the Charts & Data table filters: full-frame boolean masks vs. SalesFilter.
+
+Usage: python -m benchmarks.sales_filter [rows ...]
+"""
+
+import sys
+
+import numpy as np
+
+from benchmarks.search_index import timed
+from utils.sales_data import REGIONS, generate_sales
+from utils.sales_filter import SalesFilter
+
+FILTERS = [
+    (REGIONS, 1000, 6000),
+    (['North', 'East'], 1000, 6000),
+    (REGIONS, 2500, 3500),
+    (['West'], 4000, 4100),
+]
+
+
+def scan(df, regions, lo, hi):
+    return np.flatnonzero((df['Region'].isin(regions) & (df['Sales'] >= lo) & (df['Sales'] <= hi)).to_numpy())
+
+
+def main(sizes):
+    for rows in sizes:
+        df = generate_sales(rows, seed=0)
+        build, engine = timed(SalesFilter, df, REGIONS, repeat=1)
+        print(f"\n{rows:,} rows - index build {build:.2f}s")
+        print(f"{'filter':>32} {'matches':>10} {'mask scan':>10} {'indexed':>9} {'memoized':>9}")
+        for regions, lo, hi in FILTERS:
+            def cold_query():
+                engine.clear()
+                return engine.query(regions, lo, hi)
+
+            scan_time, expected = timed(scan, df, regions, lo, hi)
+            first, result = timed(cold_query)
+            again, _ = timed(engine.query, regions, lo, hi)
+            assert len(result) == len(expected)
+            label = f"{len(regions)} regions, {lo}-{hi}"
+            print(f"{label:>32} {len(result):>10,} {scan_time * 1000:>8.1f}ms {first * 1000:>7.1f}ms "
+                  f"{again * 1e6:>7.1f}us")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1_000_000, 10_000_000])
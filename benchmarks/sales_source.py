@@ -0,0 +1,53 @@
+"""Time loading a Parquet sales file in full vs. through ArrowFileSales with pushdown.
+
+Usage: python -m benchmarks.sales_source [rows ...]
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from benchmarks.search_index import timed
+from utils.sales_data import generate_sales
+from utils.sales_source import ArrowFileSales
+
+ROW_GROUP_ROWS = 250_000
+SCANS = [
+    ("all rows", {}),
+    ("1 region", {'regions': ('North',)}),
+    ("1 region, Sales 2000-2500", {'regions': ('North',), 'sales_min': 2000, 'sales_max': 2500}),
+]
+
+
+def write_sample(path, rows, seed=0):
+    # Extra unused columns make the projection visible, as in a real wide sales history
+    df = generate_sales(rows, seed=seed)
+    df['Notes'] = 'order notes ' + (df.index % 1000).astype(str)
+    df['Channel'] = pd.Categorical.from_codes(df.index % 3, ['Web', 'Store', 'Phone'])
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=ROW_GROUP_ROWS)
+
+
+def megabytes(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def main(sizes):
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = Path(tmp) / f"sales_{rows}.parquet"
+            write_sample(path, rows)
+            print(f"\n{rows:,} rows - {path.stat().st_size / 1e6:.1f} MB on disk")
+            full, df = timed(pd.read_parquet, path, repeat=1)
+            print(f"{'read_parquet (all columns)':>32} {len(df):>11,} rows {full * 1000:>9.1f}ms {megabytes(df):>8.1f} MB")
+            source = ArrowFileSales(path)
+            for label, predicates in SCANS:
+                elapsed, scanned = timed(source.scan, repeat=1, **predicates)
+                print(f"{label:>32} {len(scanned):>11,} rows {elapsed * 1000:>9.1f}ms {megabytes(scanned):>8.1f} MB")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1_000_000, 10_000_000])
@@ -0,0 +1,69 @@
+"""Compare the CRUD Manager search paths: ``str.contains`` scans vs. the trigram index.
+
+Usage: python -m benchmarks.search_index [rows ...]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.search_index import TrigramIndex
+
+FIRST = np.array(['Alice', 'Bob', 'Carol', 'David', 'Eva', 'Frank', 'Grace', 'Heidi', 'Ivan', 'Judy'])
+LAST = np.array(['Johnson', 'Smith', 'Davis', 'Wilson', 'Brown', 'Miller', 'Moore', 'Taylor', 'Clark', 'Lewis'])
+POSITIONS = np.array(['Senior Developer', 'Marketing Manager', 'Sales Rep', 'DevOps Engineer', 'HR Specialist',
+                      'Data Analyst', 'Product Owner', 'Accountant'])
+QUERIES = ['al', 'smith', 'devops', 'taylor42', 'zzz']
+
+
+def make_roster(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    first = FIRST[rng.integers(len(FIRST), size=rows)]
+    last = LAST[rng.integers(len(LAST), size=rows)]
+    suffix = np.arange(rows).astype(str)
+    names = pd.Series(first, dtype=object) + ' ' + last
+    emails = pd.Series(np.char.lower(first), dtype=object) + '.' + np.char.lower(last) + suffix + '@company.com'
+    return pd.DataFrame({
+        'id': suffix,
+        'name': names,
+        'email': emails,
+        'position': POSITIONS[rng.integers(len(POSITIONS), size=rows)],
+    })
+
+
+def scan(df, query):
+    return np.flatnonzero((
+        df['name'].str.contains(query, case=False, na=False, regex=False) |
+        df['email'].str.contains(query, case=False, na=False, regex=False) |
+        df['position'].str.contains(query, case=False, na=False, regex=False)
+    ).to_numpy())
+
+
+def timed(func, *args, repeat=3, **kwargs):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(sizes):
+    for rows in sizes:
+        df = make_roster(rows)
+        index = TrigramIndex()
+        build, _ = timed(lambda: index.build(df['id'], zip(df['name'], df['email'], df['position'])), repeat=1)
+        print(f"\n{rows:,} rows - index build {build:.2f}s")
+        print(f"{'query':>10} {'matches':>10} {'str.contains':>14} {'index':>10} {'speedup':>8}")
+        for query in QUERIES:
+            scan_time, expected = timed(scan, df, query)
+            index_time, found = timed(index.search, query)
+            assert len(found) == len(expected), query
+            print(f"{query:>10} {len(found):>10,} {scan_time * 1000:>12.1f}ms "
+                  f"{index_time * 1000:>8.1f}ms {scan_time / index_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,210 @@
+"""Process-wide memo caches grouped into namespaces with scoped invalidation.
+
+A namespace holds any number of memoized functions. Each cached function
+takes a *scope* as its first argument, such as a dataset version. Every
+entry is keyed by its scope, the scope's current version and the remaining
+arguments. Arguments whose names start with an underscore are left out of
+the key, as with ``st.cache_data``.
+
+``invalidate(scope)`` bumps one scope's version and drops only that scope's
+entries, so other datasets, other namespaces and other users stay warm.
+Entries can also expire after a TTL and are evicted least-recently-used
+past ``max_entries`` or ``max_bytes`` per function. Expired entries are
+swept from the whole namespace on lookups, and a scope's version is
+forgotten once it has no entries and nothing is being computed for it.
+
+Values are shared, not copied, so callers must not mutate them.
+"""
+
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+
+_ALL = object()
+SWEEP_INTERVAL = 1.0  # seconds between sweeps of expired entries
+
+
+def sizeof(value):
+    """Approximate memory held by a cached value, in bytes."""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if hasattr(value, 'memory_usage'):  # pandas objects
+        return int(np.sum(value.memory_usage(deep=True)))
+    if hasattr(value, 'nbytes'):  # NumPy and Arrow arrays
+        return int(value.nbytes)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sizeof(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class _FunctionCache:
+    """Entries of one memoized function; survives the page script being re-run."""
+
+    def __init__(self, ttl, max_entries, max_bytes):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.entries = OrderedDict()  # key -> (value, expires_at, size)
+
+    def drop(self, key):
+        self.nbytes -= self.entries.pop(key)[2]
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+
+
+class CacheNamespace:
+    """A named group of memoized functions sharing per-scope versions."""
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.RLock()
+        self._epoch = 0  # bumped when every scope is invalidated at once
+        self._versions = {}
+        self._pending = {}  # scope -> computations in flight
+        self._functions = {}
+        self._next_sweep = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, scope):
+        with self._lock:
+            return self._epoch, self._versions.get(scope, 0)
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(cache.entries) for cache in self._functions.values())
+
+    @property
+    def nbytes(self):
+        """Approximate bytes held by every entry in the namespace."""
+        with self._lock:
+            return sum(cache.nbytes for cache in self._functions.values())
+
+    def cached(self, ttl=None, max_entries=None, max_bytes=None):
+        """Decorator memoizing a function in this namespace.
+
+        ``ttl`` is in seconds; ``max_bytes`` bounds the function's entries by
+        their ``sizeof``. Functions are identified by module and qualified
+        name, so a page script re-defining them on every rerun keeps using
+        the same entries.
+        """
+        def decorator(func):
+            name = f"{func.__module__}.{func.__qualname__}"
+            signature = inspect.signature(func)
+            with self._lock:
+                cache = self._functions.get(name)
+                if cache is None:
+                    cache = self._functions[name] = _FunctionCache(ttl, max_entries, max_bytes)
+                cache.ttl, cache.max_entries, cache.max_bytes = ttl, max_entries, max_bytes
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                values = list(bound.arguments.items())
+                scope = values[0][1] if values else None
+                hashed = tuple((arg, value) for arg, value in values[1:] if not arg.startswith('_'))
+
+                with self._lock:
+                    self._sweep()
+                    version = self.version(scope)
+                    key = (scope, version, hashed)
+                    entry = cache.entries.get(key)
+                    if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                        cache.entries.move_to_end(key)
+                        self.hits += 1
+                        return entry[0]
+                    self.misses += 1
+                    self._pending[scope] = self._pending.get(scope, 0) + 1
+
+                try:
+                    value = func(*args, **kwargs)
+                    expires = time.monotonic() + cache.ttl if cache.ttl is not None else None
+                    size = sizeof(value) if cache.max_bytes is not None else 0
+                    with self._lock:
+                        # Skip storing if the scope was invalidated while this was being computed,
+                        # or if the value alone is larger than the whole byte budget
+                        fits = cache.max_bytes is None or size <= cache.max_bytes
+                        if self.version(scope) == version and fits:
+                            if key in cache.entries:
+                                cache.drop(key)
+                            cache.entries[key] = (value, expires, size)
+                            cache.nbytes += size
+                            self._evict(cache)
+                    return value
+                finally:
+                    with self._lock:
+                        self._pending[scope] -= 1
+                        if not self._pending[scope]:
+                            del self._pending[scope]
+                        self._prune(scope)
+
+            return wrapper
+        return decorator
+
+    def _evict(self, cache):
+        now = time.monotonic()
+        for key in [key for key, (_, expires, _) in cache.entries.items() if expires is not None and expires <= now]:
+            cache.drop(key)
+        while cache.max_entries is not None and len(cache.entries) > cache.max_entries:
+            cache.drop(next(iter(cache.entries)))
+        while cache.max_bytes is not None and cache.nbytes > cache.max_bytes:
+            cache.drop(next(iter(cache.entries)))
+
+    def _sweep(self):
+        # Drop expired entries of every function, at most once per SWEEP_INTERVAL; caller holds the lock
+        now = time.monotonic()
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + SWEEP_INTERVAL
+        for cache in self._functions.values():
+            for key in [key for key, (_, expires, _) in cache.entries.items() if expires is not None and expires <= now]:
+                cache.drop(key)
+        for scope in list(self._versions):
+            self._prune(scope)
+
+    def _prune(self, scope):
+        # Forget a scope's version once nothing refers to it; an in-flight computation
+        # still needs the bumped version to notice it was invalidated
+        if scope not in self._versions or scope in self._pending:
+            return
+        if not any(key[0] == scope for cache in self._functions.values() for key in cache.entries):
+            del self._versions[scope]
+
+    def invalidate(self, scope=_ALL):
+        """Drop the entries of one scope, or of every scope when none is given."""
+        with self._lock:
+            if scope is _ALL:
+                self._epoch += 1
+                self._versions.clear()
+                for cache in self._functions.values():
+                    cache.clear()
+                return
+            self._versions[scope] = self._versions.get(scope, 0) + 1
+            for cache in self._functions.values():
+                for key in [key for key in cache.entries if key[0] == scope]:
+                    cache.drop(key)
+            self._prune(scope)
+
+
+_namespaces = {}
+_namespaces_lock = threading.Lock()
+
+
+def cache_namespace(name):
+    """Return the process-wide namespace called ``name``, creating it on first use."""
+    with _namespaces_lock:
+        namespace = _namespaces.get(name)
+        if namespace is None:
+            namespace = _namespaces[name] = CacheNamespace(name)
+        return namespace
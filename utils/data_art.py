@@ -0,0 +1,137 @@
+"""Raster rendering for the Data Art Creator.
+
+Art styles are generated as NumPy point clouds, accumulated into a pixel
+buffer and encoded as one PNG, so the payload depends on the image size
+rather than on how many points were drawn. Animations are built the same
+way, with every frame computed at once over a leading frame axis.
+"""
+
+import io
+
+import numpy as np
+from PIL import Image
+
+ART_STYLES = ["Sine Wave Art", "Random Walk", "Spiral Pattern", "Fractal-like"]
+ANIMATION_STYLES = ["Sine Wave Art", "Spiral Pattern"]
+ANIMATION_FRAMES = 48
+
+# Colour stops per scheme, spread evenly from 0 to 1
+COLOR_SCHEMES = {
+    "Rainbow": ["#ff0000", "#ff7f00", "#ffff00", "#00ff00", "#0000ff", "#4b0082", "#9400d3"],
+    "Ocean": ["#03045e", "#0077b6", "#00b4d8", "#90e0ef", "#caf0f8"],
+    "Sunset": ["#3d0c45", "#9b2226", "#e85d04", "#faa307", "#ffea00"],
+    "Forest": ["#081c15", "#1b4332", "#40916c", "#74c69d", "#d8f3dc"],
+}
+BACKGROUND = (14, 17, 23)
+
+
+def color_lut(scheme, size=256):
+    """Return a ``(size, 3)`` uint8 lookup table interpolated through the scheme's stops."""
+    stops = np.array([[int(c[i:i + 2], 16) for i in (1, 3, 5)] for c in COLOR_SCHEMES[scheme]], dtype=np.float64)
+    positions = np.linspace(0, 1, len(stops))
+    grid = np.linspace(0, 1, size)
+    return np.stack([np.interp(grid, positions, stops[:, ch]) for ch in range(3)], axis=1).astype(np.uint8)
+
+
+def art_points(style, n, rng):
+    """Return ``(x, y, t)`` for ``n`` points of ``style``; ``t`` in [0, 1] picks each point's colour."""
+    if style == "Sine Wave Art":
+        per_wave = max(n // 3, 1)
+        x = np.linspace(0, 4 * np.pi, per_wave)
+        waves = [np.sin(x) * np.cos(x / 2), np.cos(x) * np.sin(x / 3), np.sin(x * 2) * 0.5]
+        t = np.linspace(0, 1, per_wave)
+        return np.tile(x, 3), np.concatenate(waves), np.tile(t, 3)
+    if style == "Random Walk":
+        per_walk = max(n // 2, 1)
+        steps = np.arange(per_walk, dtype=np.float64)
+        walks = rng.standard_normal((2, per_walk)).cumsum(axis=1)
+        t = steps / max(per_walk - 1, 1)
+        return np.tile(steps, 2), walks.ravel(), np.tile(t, 2)
+    if style == "Spiral Pattern":
+        angle = np.linspace(0, 4 * np.pi, n)
+        return angle * np.cos(angle), angle * np.sin(angle), angle / (4 * np.pi)
+    # Fractal-like: random points pushed around by a few sin/cos perturbations
+    x = rng.standard_normal(n)
+    y = rng.standard_normal(n)
+    for _ in range(3):
+        x = x + 0.1 * np.sin(y)
+        y = y + 0.1 * np.cos(x)
+    radius = np.hypot(x, y)
+    return x, y, radius / radius.max()
+
+
+def animation_points(style, n, frames=ANIMATION_FRAMES):
+    """Return ``(x, y, t)`` of shape ``(frames, n)`` for a seamless loop of ``style``.
+
+    The phase runs once around the circle, and every frame comes out of the
+    same broadcast expression over (frame, point).
+    """
+    phase = np.linspace(0, 2 * np.pi, frames, endpoint=False)[:, None]
+    if style == "Sine Wave Art":
+        per_wave = max(n // 3, 1)
+        x = np.linspace(0, 4 * np.pi, per_wave)[None, :]
+        waves = [np.sin(x + phase) * np.cos(x / 2), np.cos(x - phase) * np.sin(x / 3), np.sin(2 * (x + phase)) * 0.5]
+        t = np.linspace(0, 1, per_wave)[None, :]
+        return np.tile(x, (frames, 3)), np.concatenate(waves, axis=1), np.tile(t, (frames, 3))
+    # Spiral Pattern: one full turn per loop, with a ripple running out along the arm
+    angle = np.linspace(0, 4 * np.pi, n)[None, :]
+    radius = angle * (1 + 0.15 * np.sin(3 * angle - phase))
+    t = np.broadcast_to(angle / (4 * np.pi), (frames, n))
+    return radius * np.cos(angle + phase), radius * np.sin(angle + phase), t
+
+
+def rasterize(x, y, t, width, height, lut, margin=0.04):
+    """Accumulate points into an RGB pixel buffer.
+
+    Each pixel takes the colour of its points' mean ``t`` and a brightness
+    that grows with the log of how many points landed on it. With a leading
+    frame axis, all frames share one set of bounds and are accumulated in a
+    single pass into a ``(frames, height, width, 3)`` buffer.
+    """
+    frames = x.shape[0] if x.ndim == 2 else 1
+    x_span = max(np.ptp(x), 1e-12)
+    y_span = max(np.ptp(y), 1e-12)
+    px = ((x - x.min()) / x_span * (1 - 2 * margin) + margin) * (width - 1)
+    py = (1 - ((y - y.min()) / y_span * (1 - 2 * margin) + margin)) * (height - 1)
+    pixel = py.astype(np.int64) * width + px.astype(np.int64)
+    if x.ndim == 2:
+        pixel += np.arange(frames)[:, None] * (width * height)
+
+    size = frames * width * height
+    counts = np.bincount(pixel.ravel(), minlength=size)
+    tone = np.bincount(pixel.ravel(), weights=np.ravel(t), minlength=size)
+    hit = counts > 0
+    shade = np.zeros(size, dtype=np.uint8)
+    shade[hit] = tone[hit] / counts[hit] * (len(lut) - 1)
+    del tone
+    brightness = np.log1p(counts, dtype=np.float32)
+    brightness /= brightness.max()
+    # Keep sparse pixels visible
+    brightness[hit] = 0.35 + 0.65 * brightness[hit]
+    del counts, hit
+
+    # Blend from the background towards each pixel's colour, in place to bound memory
+    background = np.array(BACKGROUND, dtype=np.float32)
+    rgb = lut[shade].astype(np.float32)
+    rgb -= background
+    rgb *= brightness[:, None]
+    rgb += background
+    return rgb.astype(np.uint8).reshape(*x.shape[:-1], height, width, 3)
+
+
+def to_png(rgb):
+    buffer = io.BytesIO()
+    Image.fromarray(rgb).save(buffer, format="PNG", optimize=False)
+    return buffer.getvalue()
+
+
+def render_art(style, n, scheme, width, height, seed=None):
+    """Render ``n`` points of ``style`` as PNG bytes of ``width`` x ``height`` pixels."""
+    x, y, t = art_points(style, n, np.random.default_rng(seed))
+    return to_png(rasterize(x, y, t, width, height, color_lut(scheme)))
+
+
+def render_animation(style, n, scheme, width, height, frames=ANIMATION_FRAMES):
+    """Render a looping animation of ``n`` points per frame as a tuple of PNG frames."""
+    x, y, t = animation_points(style, n, frames)
+    return tuple(to_png(frame) for frame in rasterize(x, y, t, width, height, color_lut(scheme)))
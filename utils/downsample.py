@@ -0,0 +1,52 @@
+"""Point reduction for charts."""
+
+import numpy as np
+import pandas as pd
+
+
+def lttb(x, y, n_out):
+    """Return the indices of ``n_out`` points chosen by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. The points between them are
+    split into ``n_out - 2`` equal buckets. From each bucket LTTB keeps the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket. That preserves peaks and troughs a plain
+    stride would skip. ``x`` must be sorted.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Bucket averages, with the last point standing in as the bucket after the final one
+    counts = np.diff(np.append(edges, n))
+    avg_x = np.add.reduceat(x, edges) / counts
+    avg_y = np.add.reduceat(y, edges) / counts
+
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        cx, cy = avg_x[i + 1], avg_y[i + 1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def bin2d(x, y, bins):
+    """Count points on a ``bins`` x ``bins`` grid; return the non-empty cells.
+
+    Each row of the result is one cell with its ``x``/``x2`` and ``y``/``y2``
+    edges and the number of points that fell in it.
+    """
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    ix, iy = np.nonzero(counts)
+    return pd.DataFrame({
+        'x': x_edges[ix], 'x2': x_edges[ix + 1],
+        'y': y_edges[iy], 'y2': y_edges[iy + 1],
+        'count': counts[ix, iy].astype(np.int64),
+    })
@@ -0,0 +1,66 @@
+"""Running roster statistics for the CRUD Manager header."""
+
+from collections import Counter
+
+
+class EmployeeAggregates:
+    """Counts and sums kept current by the insert, update and delete paths.
+
+    Every statistic shown in the stats header is answered in O(1) from these
+    counters instead of rescanning the roster on each rerun.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.active = 0
+        self.salary_sum = 0
+        self.departments = Counter()
+
+    @classmethod
+    def from_frame(cls, df):
+        aggregates = cls()
+        aggregates.add_frame(df)
+        return aggregates
+
+    def add_frame(self, df):
+        self.count += len(df)
+        self.active += int((df['status'] == 'Active').sum())
+        self.salary_sum += int(df['salary'].sum())
+        counts = df['department'].value_counts()
+        # Categorical columns also report departments with no employees
+        self.departments.update(counts[counts > 0].to_dict())
+
+    def add(self, row):
+        self.count += 1
+        self.active += row['status'] == 'Active'
+        self.salary_sum += int(row['salary'])
+        self.departments[row['department']] += 1
+
+    def remove(self, row):
+        self.count -= 1
+        self.active -= row['status'] == 'Active'
+        self.salary_sum -= int(row['salary'])
+        self.departments[row['department']] -= 1
+        if self.departments[row['department']] <= 0:
+            del self.departments[row['department']]
+
+    def replace(self, old, new):
+        self.remove(old)
+        self.add(new)
+
+    def snapshot(self):
+        return {
+            'total': self.count,
+            'active': self.active,
+            'avg_salary': self.salary_sum / self.count if self.count else 0.0,
+            'departments': len(self.departments),
+        }
+
+    def verify(self, df):
+        """Recompute every statistic from ``df`` and list the ones that drifted."""
+        expected = EmployeeAggregates.from_frame(df)
+        mismatches = []
+        for name in ('count', 'active', 'salary_sum', 'departments'):
+            if getattr(self, name) != getattr(expected, name):
+                mismatches.append(f"{name}: running {getattr(self, name)} != recomputed {getattr(expected, name)}")
+        return mismatches
@@ -0,0 +1,144 @@
+"""Bulk employee import from CSV or Parquet uploads.
+
+Files are parsed in chunks and every rule is checked with whole-column
+operations. Valid rows are handed to the store chunk by chunk and committed
+in one transaction; the rest come back as a per-row error report.
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from utils.employee_schema import COLUMNS, DEPARTMENTS, STATUSES
+
+CHUNK_ROWS = 100_000
+REQUIRED_COLUMNS = ['name', 'email', 'department', 'position', 'salary', 'hire_date']
+SALARY_MIN = 30000
+SALARY_MAX = 200000
+EMAIL_PATTERN = r"[^@\s]+@[^@\s]+\.[^@\s]+"
+
+_HEX = np.frombuffer(b"0123456789abcdef", dtype="S1")
+
+
+def iter_upload_chunks(upload, file_name, chunk_rows=CHUNK_ROWS):
+    """Yield DataFrame chunks from a CSV or Parquet file-like object."""
+    if file_name.lower().endswith(".parquet"):
+        for batch in pq.ParquetFile(upload).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(upload, chunksize=chunk_rows, dtype=str, keep_default_na=False)
+
+
+def _new_ids(count, rng):
+    # 16 random hex digits per row, built without a per-row Python loop
+    return _HEX[rng.integers(0, 16, size=(count, 16))].view("S16").ravel().astype(str)
+
+
+def _text(chunk, column, default=""):
+    if column not in chunk:
+        return pd.Series(default, index=chunk.index, dtype=str)
+    return chunk[column].fillna("").astype(str).str.strip()
+
+
+def validate_chunk(chunk, first_row, rng):
+    """Check one chunk; return ``(valid_rows, errors)``.
+
+    ``errors`` has one ``(row, error)`` entry per failed rule, where ``row``
+    is the 1-based data row in the uploaded file.
+    """
+    chunk = chunk.reset_index(drop=True)
+    text = {col: _text(chunk, col) for col in ['name', 'email', 'department', 'position']}
+    status = _text(chunk, 'status').replace("", "Active")
+    employee_id = _text(chunk, 'id')
+    salary = pd.to_numeric(chunk['salary'], errors='coerce')
+    hire_date = pd.to_datetime(chunk['hire_date'], errors='coerce', format='ISO8601')
+    if hire_date.dt.tz is not None:
+        # Timezone-aware timestamps (e.g. from Parquet) are compared and stored as naive UTC
+        hire_date = hire_date.dt.tz_convert(None)
+
+    checks = [
+        (text['name'] == "", "name is required"),
+        (text['email'] == "", "email is required"),
+        ((text['email'] != "") & ~text['email'].str.fullmatch(EMAIL_PATTERN), "invalid email address"),
+        (~text['department'].isin(DEPARTMENTS), f"department must be one of {', '.join(DEPARTMENTS)}"),
+        (text['position'] == "", "position is required"),
+        (salary.isna(), "salary must be a number"),
+        (salary.notna() & (salary % 1 != 0), "salary must be a whole number"),
+        (salary.notna() & ((salary < SALARY_MIN) | (salary > SALARY_MAX)),
+         f"salary must be between {SALARY_MIN:,} and {SALARY_MAX:,}"),
+        (hire_date.isna(), "hire date must be a valid date"),
+        (hire_date > pd.Timestamp.today(), "hire date is in the future"),
+        (~status.isin(STATUSES), f"status must be one of {', '.join(STATUSES)}"),
+    ]
+
+    invalid = np.zeros(len(chunk), dtype=bool)
+    errors = []
+    for mask, message in checks:
+        mask = mask.to_numpy(dtype=bool, na_value=True)
+        if mask.any():
+            invalid |= mask
+            errors.append(pd.DataFrame({'row': np.flatnonzero(mask) + first_row + 1, 'error': message}))
+
+    valid = ~invalid
+    missing_id = (employee_id == "").to_numpy() & valid
+    employee_id = employee_id.to_numpy(dtype=object)
+    employee_id[missing_id] = _new_ids(int(missing_id.sum()), rng)
+
+    rows = pd.DataFrame({
+        'id': employee_id[valid],
+        'name': text['name'][valid].to_numpy(),
+        'email': text['email'][valid].to_numpy(),
+        'department': text['department'][valid].to_numpy(),
+        'position': text['position'][valid].to_numpy(),
+        'salary': salary[valid].to_numpy().astype('int64'),
+        'hire_date': hire_date[valid].to_numpy(),
+        'status': status[valid].to_numpy(),
+    }, columns=COLUMNS)
+    rows['row'] = np.flatnonzero(valid) + first_row + 1
+    return rows, errors
+
+
+def import_employees(store, upload, file_name, chunk_rows=CHUNK_ROWS, seed=None):
+    """Validate an uploaded file and insert its valid rows as one batch.
+
+    Returns ``(inserted_count, errors)`` where ``errors`` is a DataFrame with
+    one row per rejected file row and all of its problems joined together.
+    Raises ValueError when required columns are missing.
+    """
+    rng = np.random.default_rng(seed)
+    existing_ids = store.all()['id']
+    seen_ids = set()
+    errors = []
+    inserted = 0
+
+    def valid_chunks():
+        # Only the ids seen so far are kept across chunks, not the rows themselves
+        nonlocal inserted
+        first_row = 0
+        for chunk in iter_upload_chunks(upload, file_name, chunk_rows):
+            missing = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+            if missing:
+                raise ValueError(f"Missing required columns: {', '.join(missing)}")
+            rows, chunk_errors = validate_chunk(chunk, first_row, rng)
+            errors.extend(chunk_errors)
+            first_row += len(chunk)
+
+            # Ids have to be unique within the file and against the current roster
+            duplicate = (rows['id'].duplicated(keep='first') | rows['id'].isin(seen_ids)).to_numpy()
+            existing = rows['id'].isin(existing_ids).to_numpy()
+            for mask, message in [(duplicate, "id appears more than once in the file"), (existing, "id already exists")]:
+                if mask.any():
+                    errors.append(pd.DataFrame({'row': rows['row'].to_numpy()[mask], 'error': message}))
+            seen_ids.update(rows['id'])
+            rows = rows[~(duplicate | existing)]
+            inserted += len(rows)
+            yield rows[COLUMNS]
+
+    store.insert_chunks(valid_chunks())
+
+    if errors:
+        report = pd.concat(errors, ignore_index=True)
+        report = report.groupby('row', sort=True)['error'].agg("; ".join).reset_index()
+    else:
+        report = pd.DataFrame({'row': pd.Series(dtype='int64'), 'error': pd.Series(dtype=str)})
+    return inserted, report
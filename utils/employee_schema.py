@@ -0,0 +1,32 @@
+"""Column layout of the employee roster.
+
+Rows are converted to this compact layout once, where they enter the
+in-memory store, so everything downstream works on the same dtypes.
+"""
+
+import pandas as pd
+
+COLUMNS = ['id', 'name', 'email', 'department', 'position', 'salary', 'hire_date', 'status']
+DEPARTMENTS = ["Engineering", "Marketing", "Sales", "HR", "Finance", "Operations"]
+STATUSES = ["Active", "Inactive"]
+
+STRING = pd.StringDtype("pyarrow")
+# pandas has no day-resolution datetimes; seconds is the coarsest unit it keeps
+HIRE_DATE = "datetime64[s]"
+
+DTYPES = {
+    'id': STRING,
+    'name': STRING,
+    'email': STRING,
+    'department': pd.CategoricalDtype(DEPARTMENTS),
+    'position': STRING,
+    'salary': 'int32',
+    'status': pd.CategoricalDtype(STATUSES),
+}
+
+
+def to_compact(df):
+    """Return ``df`` restricted to the roster columns in the compact layout."""
+    df = df[COLUMNS].astype(DTYPES)
+    df['hire_date'] = pd.to_datetime(df['hire_date']).astype(HIRE_DATE)
+    return df
@@ -0,0 +1,333 @@
+"""SQLite-backed employee storage shared by every session of the CRUD Manager."""
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date
+from itertools import chain
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.employee_aggregates import EmployeeAggregates
+from utils.employee_schema import COLUMNS, DEPARTMENTS, STATUSES, to_compact
+from utils.employee_table import EmployeeTable
+from utils.search_index import TrigramIndex
+
+DB_PATH = os.environ.get(
+    "EMPLOYEE_DB_PATH",
+    str(Path(__file__).resolve().parent.parent / "data" / "employees.db"),
+)
+
+SEARCH_FIELDS = ['name', 'email', 'position']
+
+# Number of distinct filter combinations whose matches are memoized per version
+QUERY_CACHE_SIZE = 64
+# Inserts at least this large rebuild the search index in bulk instead of adding rows one by one
+BULK_REINDEX_ROWS = 10_000
+# Rows converted to SQL parameters and written per executemany call
+INSERT_CHUNK_ROWS = 50_000
+
+SAMPLE_EMPLOYEES = [
+    {'id': 'a1b2c3d4', 'name': 'Alice Johnson', 'email': 'alice@company.com', 'department': 'Engineering',
+     'position': 'Senior Developer', 'salary': 95000, 'hire_date': date(2020, 1, 15), 'status': 'Active'},
+    {'id': 'b2c3d4e5', 'name': 'Bob Smith', 'email': 'bob@company.com', 'department': 'Marketing',
+     'position': 'Marketing Manager', 'salary': 75000, 'hire_date': date(2021, 3, 10), 'status': 'Active'},
+    {'id': 'c3d4e5f6', 'name': 'Carol Davis', 'email': 'carol@company.com', 'department': 'Sales',
+     'position': 'Sales Rep', 'salary': 65000, 'hire_date': date(2019, 8, 22), 'status': 'Active'},
+    {'id': 'd4e5f6a7', 'name': 'David Wilson', 'email': 'david@company.com', 'department': 'Engineering',
+     'position': 'DevOps Engineer', 'salary': 88000, 'hire_date': date(2022, 5, 5), 'status': 'Active'},
+    {'id': 'e5f6a7b8', 'name': 'Eva Brown', 'email': 'eva@company.com', 'department': 'HR',
+     'position': 'HR Specialist', 'salary': 70000, 'hire_date': date(2021, 11, 30), 'status': 'Active'},
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS employees (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    department TEXT NOT NULL,
+    position TEXT NOT NULL,
+    salary INTEGER NOT NULL,
+    hire_date TEXT NOT NULL,
+    status TEXT NOT NULL
+)
+"""
+
+
+def _to_sql(col, value):
+    # SQLite has no date type, so hire dates are stored as ISO strings
+    if col == 'hire_date':
+        return pd.Timestamp(value).strftime('%Y-%m-%d')
+    if col == 'salary':
+        return int(value)
+    return value
+
+
+def _to_records(df):
+    sql = df[COLUMNS].assign(salary=df['salary'].astype('int64'),
+                             hire_date=pd.to_datetime(df['hire_date']).dt.strftime('%Y-%m-%d'))
+    # tolist() converts whole columns at once, far faster than iterating rows
+    return zip(*(sql[col].tolist() for col in COLUMNS))
+
+
+_INSERT = f"INSERT INTO employees ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+
+class ConnectionPool:
+    """Fixed-size pool of SQLite connections opened in WAL mode."""
+
+    def __init__(self, path, size=4):
+        self._path = path
+        self._pool = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(self._connect())
+
+    def _connect(self):
+        conn = sqlite3.connect(self._path, check_same_thread=False, timeout=30)
+        # WAL lets readers proceed while a writer holds the lock
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+
+class EmployeeStore:
+    """Process-wide employee roster.
+
+    SQLite is the system of record; reads are served from an in-memory
+    EmployeeTable shared by every session and written through on each change,
+    so per-session memory does not grow with the number of connected users.
+
+    Writers are serialized by their own lock and do their SQLite work
+    outside ``_lock``, which guards the in-memory state and is only held
+    to read it or to fold in a committed change.
+    """
+
+    def __init__(self, path=DB_PATH, pool_size=4):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._pool = ConnectionPool(path, pool_size)
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._table = None
+        self._aggregates = None
+        self._index = None
+        self._query_cache = {}
+        self.version = 0
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._pool.connection() as conn, conn:
+            conn.execute(_SCHEMA)
+            if conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0] == 0:
+                conn.executemany(_INSERT, _to_records(pd.DataFrame(SAMPLE_EMPLOYEES)))
+
+    def _load(self):
+        with self._pool.connection() as conn:
+            df = pd.read_sql_query(f"SELECT {', '.join(COLUMNS)} FROM employees ORDER BY rowid", conn)
+        return to_compact(df)
+
+    def _invalidate(self):
+        self._query_cache.clear()
+        self.version += 1
+
+    # Reads
+
+    def _roster(self):
+        if self._table is None:
+            df = self._load()
+            self._table = EmployeeTable(df)
+            self._aggregates = EmployeeAggregates.from_frame(df)
+        return self._table
+
+    def all(self):
+        """Return the shared roster snapshot. Callers must not mutate it."""
+        with self._lock:
+            return self._roster().frame()
+
+    @staticmethod
+    def _build_index(frames):
+        index = TrigramIndex()
+        index.build(chain.from_iterable(df['id'] for df in frames),
+                    chain.from_iterable(zip(*(df[col] for col in SEARCH_FIELDS)) for df in frames))
+        return index
+
+    def _search_index(self):
+        # Built once from the first snapshot, then kept current by every write
+        if self._index is None:
+            self._index = self._build_index([self.all()])
+        return self._index
+
+    def get(self, employee_id):
+        with self._lock:
+            return self._roster().get(employee_id)
+
+    def query(self, search="", department="All", status="All", fuzzy=False):
+        """Return the roster row positions matching the filters.
+
+        The search text is resolved through the trigram index; fuzzy matches
+        come back ranked by similarity, everything else in roster order.
+        Results are memoized per filter combination until the next write, so
+        paging through a result set does not re-run the filters.
+        """
+        key = (search.lower(), department, status, fuzzy)
+        with self._lock:
+            positions = self._query_cache.get(key)
+            if positions is not None:
+                return positions
+
+            table = self._roster()
+            if search and fuzzy:
+                matches = self._search_index().fuzzy_search(search)
+                positions = table.positions([employee_id for employee_id, _ in matches])
+            elif search:
+                positions = np.sort(table.positions(self._search_index().search(search)))
+            else:
+                positions = table.live_positions()
+            if department != "All":
+                positions = positions[table.values('department', positions) == department]
+            if status != "All":
+                positions = positions[table.values('status', positions) == status]
+
+            if len(self._query_cache) >= QUERY_CACHE_SIZE:
+                self._query_cache.pop(next(iter(self._query_cache)))
+            self._query_cache[key] = positions
+            return positions
+
+    def take(self, positions):
+        """Materialize only the given roster rows, e.g. one page of results."""
+        with self._lock:
+            return self._roster().take(positions)
+
+    def snapshot(self):
+        """Return ``(version, roster)`` read together, e.g. to key an export by the data it holds.
+
+        The roster frame is never edited after it is handed out, so it keeps
+        matching ``version`` whatever is written later.
+        """
+        with self._lock:
+            return self.version, self._roster().frame()
+
+    def departments(self):
+        with self._lock:
+            self._roster()
+            return sorted(self._aggregates.departments)
+
+    def stats(self):
+        with self._lock:
+            self._roster()
+            return self._aggregates.snapshot()
+
+    def check_aggregates(self):
+        """Debug helper: recompute the header statistics from scratch and report any drift."""
+        with self._lock:
+            df = self.all()
+            return self._aggregates.verify(df)
+
+    # Writes
+
+    def insert(self, employees):
+        """Insert one employee (a dict), a list of them or a DataFrame in a single transaction.
+
+        This is the insert path for the add form; bulk imports stream their
+        chunks through ``insert_chunks``.
+        """
+        if isinstance(employees, dict):
+            employees = [employees]
+        if not isinstance(employees, pd.DataFrame):
+            employees = pd.DataFrame(list(employees), columns=COLUMNS)
+        self.insert_chunks([employees])
+
+    def insert_chunks(self, chunks):
+        """Insert an iterable of DataFrames in a single transaction.
+
+        Each chunk is converted and written to SQLite as it arrives, so only
+        the compact rows are kept until the transaction commits. Nothing is
+        visible to readers before then, and the in-memory lock is only held
+        to fold the committed rows into the table, aggregates and index.
+        """
+        with self._write_lock:
+            with self._lock:
+                self._roster()
+                indexed = self._index is not None
+            batches = []
+            with self._pool.connection() as conn, conn:
+                for chunk in chunks:
+                    if chunk.empty:
+                        continue
+                    batch = to_compact(chunk).reset_index(drop=True)
+                    for start in range(0, len(batch), INSERT_CHUNK_ROWS):
+                        conn.executemany(_INSERT, _to_records(batch.iloc[start:start + INSERT_CHUNK_ROWS]))
+                    batches.append(batch)
+            if not batches:
+                return
+
+            # Writes are serialized, so the roster read here is still current and the
+            # new index can be built from it without holding the in-memory lock
+            index = None
+            if indexed and sum(map(len, batches)) >= BULK_REINDEX_ROWS:
+                with self._lock:
+                    roster = self._table.frame()
+                index = self._build_index([roster, *batches])
+            with self._lock:
+                for batch in batches:
+                    self._table.insert(batch)
+                    self._aggregates.add_frame(batch)
+                if index is not None:
+                    self._index = index
+                elif self._index is not None:
+                    for batch in batches:
+                        for employee_id, *fields in batch[['id', *SEARCH_FIELDS]].itertuples(index=False, name=None):
+                            self._index.add(employee_id, fields)
+                self._invalidate()
+
+    def update(self, employee_id, fields):
+        fields = {col: value for col, value in fields.items() if col in COLUMNS and col != 'id'}
+        if not fields:
+            return
+        with self._write_lock:
+            current = self.get(employee_id)
+            if current is None:
+                return
+            with self._pool.connection() as conn, conn:
+                conn.execute(
+                    f"UPDATE employees SET {', '.join(f'{col} = ?' for col in fields)} WHERE id = ?",
+                    (*(_to_sql(col, value) for col, value in fields.items()), employee_id)
+                )
+            updated = {**current, **fields}
+            with self._lock:
+                self._table.update(employee_id, fields)
+                self._aggregates.replace(current, updated)
+                if self._index is not None:
+                    self._index.update(employee_id, [updated[col] for col in SEARCH_FIELDS])
+                self._invalidate()
+
+    def delete(self, employee_id):
+        with self._write_lock:
+            current = self.get(employee_id)
+            if current is None:
+                return
+            with self._pool.connection() as conn, conn:
+                conn.execute("DELETE FROM employees WHERE id = ?", (employee_id,))
+            with self._lock:
+                self._table.delete(employee_id)
+                self._aggregates.remove(current)
+                if self._index is not None:
+                    self._index.remove(employee_id)
+                self._invalidate()
+
+
+@st.cache_resource
+def get_employee_store():
+    return EmployeeStore()
@@ -0,0 +1,184 @@
+"""In-memory columnar copy of the employee roster."""
+
+import numpy as np
+import pandas as pd
+
+# Drop tombstoned rows once they make up this share of the table
+PURGE_RATIO = 0.25
+PURGE_MIN_ROWS = 64
+# Write pending edits back into the columns once this many rows have them
+PATCH_FLUSH_ROWS = 1024
+
+
+class EmployeeTable:
+    """Roster columns with an append buffer, a primary-key index and tombstones.
+
+    Inserted batches are parked in a list and only folded into the
+    contiguous columns when a read needs them, so a burst of k inserts costs
+    one concatenation instead of k full copies. Every row keeps a stable
+    position found through an ``id -> position`` hash index: edits are
+    recorded as one pending patch per row, overlaid on the few rows a lookup
+    or a page returns, and written back in a single batched pass once enough
+    pile up or the whole frame is read. Deletes only mark the row as dead
+    until enough tombstones pile up to be worth compacting away.
+    """
+
+    def __init__(self, frame):
+        self._frame = frame.reset_index(drop=True)
+        self._pending = []
+        self._patches = {}
+        self._size = len(self._frame)
+        self._alive = np.ones(self._size, dtype=bool)
+        self._pos = dict(zip(self._frame['id'], range(self._size)))
+        self._dead = 0
+        self._view = None
+        self._shared = False  # whether frame() has handed out self._frame itself
+
+    def __len__(self):
+        return len(self._pos)
+
+    def __contains__(self, employee_id):
+        return employee_id in self._pos
+
+    # Writes
+
+    def insert(self, rows):
+        """Append a DataFrame of new rows, from a single row up to a bulk load."""
+        start = self._size
+        self._size += len(rows)
+        self._pos.update(zip(rows['id'], range(start, self._size)))
+        self._pending.append(rows)
+        if self._size > len(self._alive):
+            grow = max(self._size - len(self._alive), len(self._alive))
+            self._alive = np.concatenate([self._alive, np.zeros(grow, dtype=bool)])
+        self._alive[start:self._size] = True
+        self._view = None
+
+    def update(self, employee_id, fields):
+        pos = self._pos.get(employee_id)
+        if pos is None:
+            return
+        # Patches to rows still in the append buffer are overlaid once it is flushed
+        self._patches.setdefault(pos, {}).update(fields)
+        self._view = None
+
+    def delete(self, employee_id):
+        pos = self._pos.pop(employee_id, None)
+        if pos is None:
+            return
+        self._alive[pos] = False
+        self._patches.pop(pos, None)
+        self._dead += 1
+        self._view = None
+
+    def _compact(self):
+        if self._pending:
+            self._frame = pd.concat([self._frame, *self._pending], ignore_index=True)
+            self._pending = []
+            self._shared = False
+
+        purge = self._dead > max(PURGE_MIN_ROWS, PURGE_RATIO * len(self._frame))
+        if purge or len(self._patches) >= PATCH_FLUSH_ROWS:
+            self._flush_patches()
+
+        if purge:
+            self._frame = self._frame[self._alive[:len(self._frame)]].reset_index(drop=True)
+            self._shared = False
+            self._size = len(self._frame)
+            self._alive = np.ones(self._size, dtype=bool)
+            self._pos = dict(zip(self._frame['id'], range(self._size)))
+            self._dead = 0
+
+    @staticmethod
+    def _patch_columns(patches):
+        # Group {position: {column: value}} into {column: (positions, values)}
+        by_column = {}
+        for pos, fields in patches.items():
+            for col, value in fields.items():
+                positions, values = by_column.setdefault(col, ([], []))
+                positions.append(pos)
+                values.append(value)
+        return by_column
+
+    def _flush_patches(self):
+        if not self._patches:
+            return
+        # One vectorized write per column covering every row edited since the last flush.
+        # Columns are patched in place unless frame() has handed this frame out; then the
+        # edited columns are rebuilt on a shallow copy so its readers never see them change
+        frame = self._frame.copy(deep=False) if self._shared else self._frame
+        for col, (positions, values) in self._patch_columns(self._patches).items():
+            # Cast to the column's own dtype so edits keep the compact layout
+            values = pd.array(values, dtype=frame[col].dtype)
+            if self._shared:
+                column = frame[col].array.copy()
+                column[positions] = values
+                frame[col] = column
+            else:
+                frame.iloc[positions, frame.columns.get_loc(col)] = values
+        self._frame = frame
+        self._shared = False
+        self._patches = {}
+
+    # Reads
+
+    def frame(self):
+        """Return the live rows as one contiguous frame."""
+        if self._view is None:
+            self._compact()
+            self._flush_patches()
+            if self._dead:
+                self._view = self._frame[self._alive[:len(self._frame)]]
+            else:
+                self._view = self._frame
+                self._shared = True
+        return self._view
+
+    def get(self, employee_id):
+        pos = self._pos.get(employee_id)
+        if pos is None:
+            return None
+        if pos >= len(self._frame):
+            # Still in the append buffer; flushing it may also renumber rows
+            self._compact()
+            pos = self._pos[employee_id]
+        row = self._frame.iloc[pos].to_dict()
+        row.update(self._patches.get(pos, {}))
+        return row
+
+    def positions(self, employee_ids):
+        """Map ids to row positions, preserving order and skipping unknown ids."""
+        self._compact()
+        return np.array([self._pos[i] for i in employee_ids if i in self._pos], dtype=np.int64)
+
+    def live_positions(self):
+        self._compact()
+        return np.flatnonzero(self._alive[:len(self._frame)])
+
+    def _patched(self, positions):
+        # Indexes into ``positions`` of the rows with pending edits
+        if not self._patches:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(np.isin(positions, np.fromiter(self._patches, dtype=np.int64)))
+
+    def values(self, column, positions):
+        # Kept in the column's own array type, so e.g. categorical comparisons run on the codes
+        values = self._frame[column].array.take(positions)
+        hits = [i for i in self._patched(positions) if column in self._patches[positions[i]]]
+        if hits:
+            values[hits] = [self._patches[positions[i]][column] for i in hits]
+        return values
+
+    def take(self, positions):
+        self._compact()
+        # Positions may come from a query made before a concurrent write
+        positions = positions[positions < len(self._frame)]
+        positions = positions[self._alive[positions]]
+        rows = self._frame.iloc[positions]
+        hits = self._patched(positions)
+        if len(hits):
+            rows = rows.copy()
+            patches = {i: self._patches[positions[i]] for i in hits}
+            for col, (index, values) in self._patch_columns(patches).items():
+                rows.iloc[index, rows.columns.get_loc(col)] = pd.array(values, dtype=rows[col].dtype)
+        return rows
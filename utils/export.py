@@ -0,0 +1,86 @@
+"""Chunked, cached exports of tabular data as CSV, gzip-compressed CSV or Parquet."""
+
+import io
+import zlib
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.cache import cache_namespace
+
+CHUNK_ROWS = 50_000
+# Finished export files kept for repeated downloads; a file larger than the budget is never kept
+EXPORT_CACHE_BYTES = 256 * 1024 * 1024
+EXPORT_CACHE_TTL = 600
+
+export_cache = cache_namespace("exports")
+
+# Format label -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def iter_frame_chunks(df, chunk_rows=CHUNK_ROWS):
+    if len(df) == 0:
+        yield df
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def iter_csv(chunks):
+    header = True
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=header).encode()
+        header = False
+
+
+def iter_gzip(blocks):
+    compressor = zlib.compressobj(wbits=31)  # 31 selects the gzip container
+    for block in blocks:
+        data = compressor.compress(block)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_parquet(chunks):
+    # Each chunk becomes one row group; bytes are handed out as soon as they are written
+    sink = io.BytesIO()
+    writer = None
+    for chunk in chunks:
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(sink, table.schema)
+        writer.write_table(table)
+        yield sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+    if writer is not None:
+        writer.close()
+        yield sink.getvalue()
+
+
+def export_chunks(chunks, fmt):
+    """Encode an iterable of DataFrame chunks in ``fmt``, yielding bytes as they are produced."""
+    if fmt == "CSV":
+        return iter_csv(chunks)
+    if fmt == "CSV (gzip)":
+        return iter_gzip(iter_csv(chunks))
+    if fmt == "Parquet":
+        return iter_parquet(chunks)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+@export_cache.cached(ttl=EXPORT_CACHE_TTL, max_bytes=EXPORT_CACHE_BYTES)
+def cached_export(content_version, fmt, _chunks):
+    """Return the full export for one content version.
+
+    ``content_version`` identifies the data being exported and is the only
+    part of the cache key besides the format; ``_chunks`` is a zero-argument
+    callable producing the DataFrame chunks and is only called on a miss.
+    Hits return the stored bytes themselves, not a copy.
+    """
+    return b"".join(export_chunks(_chunks(), fmt))
@@ -0,0 +1,164 @@
+"""Tiled escape-time renderer for the Mandelbrot and Julia sets.
+
+The plane is cut into fixed square tiles on a grid that depends only on the
+zoom level, so panning or zooming back reuses tiles already in the cache and
+only new tiles are computed. Missing tiles are computed in a process pool,
+each one vectorized with NumPy.
+"""
+
+import math
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import streamlit as st
+
+from utils.data_art import BACKGROUND, color_lut
+
+TILE = 128  # tile edge in pixels
+COARSE_STEP = 8  # the preview samples one pixel in COARSE_STEP x COARSE_STEP
+BASE_SCALE = 3.5 / 1024  # plane units per pixel at zoom level 0
+MAX_LEVEL = 36  # deeper zooms run out of float64 precision
+TILE_CACHE_BYTES = 256 * 1024 * 1024
+# Escaped points keep iterating until |z| passes this radius, for smooth colouring
+BAILOUT = 256.0
+
+FRACTALS = ["Mandelbrot set", "Julia set"]
+HOME = {"Mandelbrot set": (-0.6, 0.0), "Julia set": (0.0, 0.0)}
+# Julia set constants offered on the page, kept as strings so they hash cleanly in tile keys
+JULIA_CONSTANTS = ["-0.8+0.156j", "0.285+0.01j", "-0.4+0.6j", "-0.70176-0.3842j", "-0.835-0.2321j"]
+
+
+def scale_at(level):
+    return BASE_SCALE / 2 ** level
+
+
+def escape_time(z, c, max_iter):
+    """Smooth iteration count at which each point of ``z`` escapes, or -1 if it never does.
+
+    Points are dropped from the working arrays as they escape, so each
+    iteration only touches the points still bounded.
+    """
+    shape = z.shape
+    z, c = z.ravel().copy(), np.broadcast_to(c, shape).ravel().copy()
+    result = np.full(z.size, -1.0, dtype=np.float32)
+    index = np.arange(z.size)
+    for n in range(1, max_iter + 1):
+        z = z * z + c
+        escaped = z.real * z.real + z.imag * z.imag > BAILOUT * BAILOUT
+        if escaped.any():
+            result[index[escaped]] = np.maximum(n + 1 - np.log2(np.log(np.abs(z[escaped]))), 0)
+            keep = ~escaped
+            z, c, index = z[keep], c[keep], index[keep]
+            if not index.size:
+                break
+    return result.reshape(shape)
+
+
+def compute_tile(fractal, julia_c, level, ix, iy, max_iter, step=1):
+    """Escape times for one tile, sampled every ``step`` pixels.
+
+    Tile ``(ix, iy)`` covers global pixels ``ix * TILE`` to ``(ix + 1) * TILE``
+    at ``level``; pixel rows grow downwards, i.e. towards negative imaginary parts.
+    """
+    scale = scale_at(level)
+    offsets = np.arange(0, TILE, step) + step / 2
+    re = (ix * TILE + offsets) * scale
+    im = -(iy * TILE + offsets) * scale
+    points = re[None, :] + 1j * im[:, None]
+    if fractal == "Julia set":
+        return escape_time(points, complex(julia_c), max_iter)
+    return escape_time(np.zeros_like(points), points, max_iter)
+
+
+class TileCache:
+    """Least-recently-used tile store bounded by the bytes of the arrays it holds."""
+
+    def __init__(self, max_bytes=TILE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._tiles
+
+    def get(self, key):
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+            return tile
+
+    def put(self, key, tile):
+        with self._lock:
+            if key in self._tiles:
+                self.nbytes -= self._tiles.pop(key).nbytes
+            self._tiles[key] = tile
+            self.nbytes += tile.nbytes
+            while self.nbytes > self.max_bytes and len(self._tiles) > 1:
+                self.nbytes -= self._tiles.popitem(last=False)[1].nbytes
+
+
+class FractalRenderer:
+    """Assembles viewport images from cached tiles, computing missing ones in a process pool."""
+
+    def __init__(self, workers=None, cache_bytes=TILE_CACHE_BYTES):
+        self.workers = workers or os.cpu_count() or 1
+        # Spawned workers avoid forking the server's threads
+        self._pool = ProcessPoolExecutor(self.workers, mp_context=get_context("spawn"))
+        self.cache = TileCache(cache_bytes)
+
+    def tiles(self, center, level, width, height):
+        """Return ``(left, top, keys)``: the viewport's top-left global pixel and its tile grid."""
+        scale = scale_at(level)
+        left = round(center[0] / scale - width / 2)
+        top = round(-center[1] / scale - height / 2)
+        columns = range(math.floor(left / TILE), math.floor((left + width - 1) / TILE) + 1)
+        rows = range(math.floor(top / TILE), math.floor((top + height - 1) / TILE) + 1)
+        return left, top, [[(ix, iy) for ix in columns] for iy in rows]
+
+    def render(self, fractal, julia_c, center, level, width, height, max_iter, step=1):
+        """Return ``(escape_times, computed, total)``: the viewport and how many of its tiles were new."""
+        left, top, grid = self.tiles(center, level, width, height)
+        keys = {(ix, iy): (fractal, julia_c, level, ix, iy, max_iter, step) for row in grid for ix, iy in row}
+        tiles = {pos: self.cache.get(key) for pos, key in keys.items()}
+        todo = [pos for pos, tile in tiles.items() if tile is None]
+        if todo:
+            args = [keys[pos] for pos in todo]
+            for pos, tile in zip(todo, self._pool.map(compute_tile, *zip(*args))):
+                tiles[pos] = tile
+                self.cache.put(keys[pos], tile)
+
+        canvas = np.vstack([np.hstack([tiles[pos] for pos in row]) for row in grid])
+        if step > 1:
+            canvas = canvas.repeat(step, axis=0).repeat(step, axis=1)
+        x0, y0 = left - grid[0][0][0] * TILE, top - grid[0][0][1] * TILE
+        return canvas[y0:y0 + height, x0:x0 + width], len(todo), len(keys)
+
+    def is_cached(self, fractal, julia_c, center, level, width, height, max_iter, step=1):
+        _, _, grid = self.tiles(center, level, width, height)
+        return all((fractal, julia_c, level, ix, iy, max_iter, step) in self.cache for row in grid for ix, iy in row)
+
+
+def colorize(escape_times, max_iter, scheme):
+    """Map escape times to RGB; points inside the set get the background colour."""
+    lut = color_lut(scheme)
+    inside = escape_times < 0
+    level = np.sqrt(np.clip(escape_times, 0, max_iter) / max_iter)
+    rgb = lut[(level * (len(lut) - 1)).astype(np.int64)]
+    rgb[inside] = BACKGROUND
+    return rgb
+
+
+@st.cache_resource
+def get_fractal_renderer():
+    """Process-wide renderer, so every session shares the worker pool and the tile cache."""
+    return FractalRenderer()
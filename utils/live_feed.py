@@ -0,0 +1,131 @@
+"""Live sales stream: a background producer filling a shared ring buffer."""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.rolling_stats import RollingStats
+from utils.sales_data import MEASURES, REGIONS, draw_sales
+
+CAPACITY = 100_000
+INTERVAL = 0.5  # seconds between produced batches
+ROWS_PER_BATCH = 20
+# The producer pauses once no session has read from the feed for this long
+IDLE_SECONDS = 60
+
+
+class RingBuffer:
+    """Fixed-capacity columnar buffer that overwrites its oldest rows.
+
+    Rows are numbered by a global sequence (``total`` is the number ever
+    appended), so readers can ask for everything after the last row they
+    saw. Appends and reads cost time proportional to the rows involved,
+    never to the stream's history.
+    """
+
+    def __init__(self, capacity, dtypes):
+        self.capacity = capacity
+        self._columns = {col: np.empty(capacity, dtype=dtype) for col, dtype in dtypes.items()}
+        self._lock = threading.Lock()
+        self.total = 0
+
+    def append(self, rows):
+        n = len(next(iter(rows.values())))
+        skip = max(n - self.capacity, 0)  # a batch larger than the buffer keeps only its tail
+        with self._lock:
+            start = (self.total + skip) % self.capacity
+            first = min(n - skip, self.capacity - start)
+            for col, values in rows.items():
+                values = values[skip:]
+                self._columns[col][start:start + first] = values[:first]
+                self._columns[col][:len(values) - first] = values[first:]
+            self.total += n
+
+    def _read(self, seq):
+        # Rows from sequence number seq to the end; caller holds the lock
+        seq = max(seq, self.total - self.capacity, 0)
+        start, stop = seq % self.capacity, seq % self.capacity + (self.total - seq)
+        if stop <= self.capacity:
+            return {col: values[start:stop].copy() for col, values in self._columns.items()}
+        return {col: np.concatenate([values[start:], values[:stop - self.capacity]])
+                for col, values in self._columns.items()}
+
+    def since(self, seq):
+        """Return ``(rows, total)``: rows appended after sequence ``seq`` still in the buffer."""
+        with self._lock:
+            return self._read(seq), self.total
+
+    def tail(self, n):
+        """Return the last ``n`` rows, oldest first."""
+        with self._lock:
+            return self._read(self.total - n)
+
+
+class LiveSalesFeed:
+    """Appends a batch of random sales rows to a RingBuffer every ``interval`` seconds.
+
+    Stream-wide totals and rolling windows are kept in a RollingStats that is
+    extended with each batch, so readers never rescan the stream.
+    """
+
+    def __init__(self, capacity=CAPACITY, interval=INTERVAL, rows_per_batch=ROWS_PER_BATCH, seed=None):
+        self.buffer = RingBuffer(capacity, {'Date': 'datetime64[ms]', **{m: np.int32 for m in MEASURES},
+                                            'Region': np.int8})
+        self.interval = interval
+        self.rows_per_batch = rows_per_batch
+        self.stats = RollingStats(MEASURES)
+        self._rng = np.random.default_rng(seed)
+        self._last_read = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="live-sales-feed", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if time.monotonic() - self._last_read < IDLE_SECONDS:
+                self.produce(self.rows_per_batch)
+
+    def produce(self, n):
+        now = np.datetime64(pd.Timestamp.now(), 'ms')
+        rows = draw_sales(self._rng, n)
+        # Spread the batch evenly over the interval it stands for
+        step = np.timedelta64(int(self.interval * 1000 / max(n, 1)), 'ms')
+        rows = {'Date': now - step * np.arange(n - 1, -1, -1), **rows}
+        self.buffer.append(rows)
+        self.stats.extend(rows)
+
+    def since(self, seq):
+        """Return ``(frame, total)`` with the rows appended after sequence ``seq``."""
+        self._last_read = time.monotonic()
+        rows, total = self.buffer.since(seq)
+        return to_frame(rows), total
+
+    def tail(self, n):
+        self._last_read = time.monotonic()
+        return to_frame(self.buffer.tail(n))
+
+    @property
+    def total(self):
+        return self.buffer.total
+
+
+def to_frame(rows):
+    frame = pd.DataFrame(rows)
+    frame['Region'] = pd.Categorical.from_codes(frame['Region'], REGIONS)
+    return frame
+
+
+@st.cache_resource
+def get_live_feed():
+    """Process-wide feed shared by every session; started on first use."""
+    feed = LiveSalesFeed()
+    feed.start()
+    return feed
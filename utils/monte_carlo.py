@@ -0,0 +1,84 @@
+"""Monte Carlo random walks summarised as per-step mean and percentile bands.
+
+Walks are simulated in chunks, each a single batched cumulative sum over a
+``(walks, steps)`` block of normal increments. Each chunk only contributes
+a fixed-bin histogram per step plus per-step sums, and these merge by
+addition. Memory therefore depends on the chunk size and the number of
+steps, never on the number of walks, and chunks can run in worker processes.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+BINS = 256
+# Bins span +/- RANGE_SIGMAS standard deviations of the walk at each step
+RANGE_SIGMAS = 5.0
+CHUNK_CELLS = 4_000_000  # walk-steps simulated per chunk
+PERCENTILES = [5, 25, 75, 95]
+
+
+def _bin_widths(n_steps):
+    # After k steps of N(0, 1) increments a walk has standard deviation sqrt(k)
+    return 2 * RANGE_SIGMAS * np.sqrt(np.arange(1, n_steps + 1)) / BINS
+
+
+def simulate_chunk(n_walks, n_steps, seed):
+    """Return ``(histogram, sums)`` for ``n_walks`` walks: a ``(n_steps, BINS)`` count array and per-step sums."""
+    rng = np.random.default_rng(seed)
+    positions = rng.standard_normal((n_walks, n_steps), dtype=np.float32).cumsum(axis=1)
+    bins = (positions / _bin_widths(n_steps).astype(np.float32) + BINS / 2).astype(np.int64)
+    np.clip(bins, 0, BINS - 1, out=bins)
+    bins += np.arange(n_steps) * BINS
+    histogram = np.bincount(bins.ravel(), minlength=n_steps * BINS).reshape(n_steps, BINS)
+    return histogram, positions.sum(axis=0, dtype=np.float64)
+
+
+def percentile_bands(histogram, n_walks, percentiles=PERCENTILES):
+    """Interpolate per-step percentiles from merged histograms; returns one array per percentile."""
+    widths = _bin_widths(len(histogram))
+    cdf = histogram.cumsum(axis=1)
+    steps = np.arange(len(histogram))
+    bands = {}
+    for q in percentiles:
+        target = q / 100 * n_walks
+        b = np.minimum((cdf < target).sum(axis=1), BINS - 1)
+        before = np.where(b > 0, cdf[steps, b - 1], 0)
+        within = (target - before) / np.maximum(histogram[steps, b], 1)
+        bands[q] = (b + within - BINS / 2) * widths
+    return bands
+
+
+def simulate_walks(n_walks, n_steps, seed=None, executor=None):
+    """Simulate ``n_walks`` walks of ``n_steps`` and return ``(bands, seconds)``.
+
+    ``bands`` has a row per step with the Mean and P5/P25/P75/P95 columns.
+    Chunks draw from independent streams spawned from ``seed``, so the result
+    is the same whether or not an ``executor`` spreads them over processes.
+    """
+    chunk = max(1, CHUNK_CELLS // n_steps)
+    sizes = [min(chunk, n_walks - start) for start in range(0, n_walks, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    start = time.perf_counter()
+    mapper = executor.map if executor is not None else map
+    histogram = np.zeros((n_steps, BINS), dtype=np.int64)
+    sums = np.zeros(n_steps)
+    for chunk_histogram, chunk_sums in mapper(simulate_chunk, sizes, [n_steps] * len(sizes), seeds):
+        histogram += chunk_histogram
+        sums += chunk_sums
+    bands = pd.DataFrame({'Step': np.arange(1, n_steps + 1), 'Mean': sums / n_walks})
+    for q, values in percentile_bands(histogram, n_walks).items():
+        bands[f'P{q}'] = values
+    return bands, time.perf_counter() - start
+
+
+@st.cache_resource
+def get_walk_pool():
+    """Process pool shared by every session for Monte Carlo chunks."""
+    return ProcessPoolExecutor(os.cpu_count() or 1, mp_context=get_context("spawn"))
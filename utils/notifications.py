@@ -0,0 +1,20 @@
+"""Session-scoped flash messages that survive ``st.rerun()``.
+
+Actions queue a message with :func:`flash` and rerun straight away; the
+next render drains the queue with :func:`show_flashes` and shows each
+message as a toast, so nothing has to sleep on the script thread to keep a
+message visible.
+"""
+
+import streamlit as st
+
+_QUEUE_KEY = "_flash_messages"
+
+
+def flash(message, icon=None):
+    st.session_state.setdefault(_QUEUE_KEY, []).append((message, icon))
+
+
+def show_flashes():
+    for message, icon in st.session_state.pop(_QUEUE_KEY, []):
+        st.toast(message, icon=icon)
@@ -0,0 +1,98 @@
+"""Incrementally maintained totals and rolling-window statistics for the KPI cards."""
+
+import threading
+
+import numpy as np
+
+# Largest window the statistics can answer; only the last 2 * MAX_WINDOW rows are kept
+MAX_WINDOW = 10_000
+
+
+def _widen(values):
+    return values.astype(np.int64 if values.dtype.kind in 'biu' else np.float64, copy=False)
+
+
+class RollingStats:
+    """Running totals plus trailing-window sums over an append-only series.
+
+    ``extend`` adds a batch of rows in time proportional to the batch: totals
+    are bumped by the batch sums, and only a tail of the latest
+    ``2 * max_window`` rows is retained so any window and the one before it
+    can be answered without looking at the full history.
+    """
+
+    def __init__(self, measures, max_window=MAX_WINDOW):
+        self.measures = list(measures)
+        self.max_window = max_window
+        self.count = 0
+        self.totals = dict.fromkeys(self.measures, 0)
+        self.first = None
+        self._tail = {m: np.empty(0, dtype=np.int64) for m in self.measures}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df, measures, max_window=MAX_WINDOW):
+        stats = cls(measures, max_window)
+        stats.extend(df)
+        return stats
+
+    def extend(self, rows):
+        """Append a DataFrame or a dict of equal-length arrays.
+
+        Integer measures are summed as int64 and float measures as float64,
+        so fractional amounts are never truncated.
+        """
+        columns = {m: _widen(np.asarray(rows[m])) for m in self.measures}
+        n = len(columns[self.measures[0]])
+        if n == 0:
+            return
+        keep = 2 * self.max_window
+        with self._lock:
+            if self.first is None:
+                self.first = {m: values[0].item() for m, values in columns.items()}
+            for m, values in columns.items():
+                self.totals[m] += values.sum().item()
+                tail = values[-keep:] if len(values) >= keep else np.concatenate([self._tail[m], values])[-keep:]
+                self._tail[m] = tail
+            self.count += n
+
+    def _window(self, measure, size, back):
+        # The ``size`` rows ending ``back`` windows before the latest row
+        size = max(1, min(size, self.max_window))
+        tail = self._tail[measure]
+        end = len(tail) - back * size
+        return tail[max(end - size, 0):max(end, 0)]
+
+    def window_sum(self, measure, size, back=0):
+        with self._lock:
+            return self._window(measure, size, back).sum().item()
+
+    def window_mean(self, measure, size, back=0):
+        with self._lock:
+            values = self._window(measure, size, back)
+            return float(values.mean()) if len(values) else float('nan')
+
+    def mean(self, measure):
+        with self._lock:
+            return self.totals[measure] / self.count if self.count else float('nan')
+
+    def last(self, measure):
+        with self._lock:
+            tail = self._tail[measure]
+            return tail[-1].item() if len(tail) else None
+
+    def delta(self, measure, size):
+        """Sum of the latest ``size`` rows minus the sum of the ``size`` rows before them."""
+        return self.window_sum(measure, size) - self.window_sum(measure, size, back=1)
+
+    def growth(self, measure, size):
+        """Percentage change of the latest window's mean over the previous window's mean."""
+        current, previous = self.window_mean(measure, size), self.window_mean(measure, size, back=1)
+        return (current - previous) / previous * 100 if previous else float('nan')
+
+    def growth_since_first(self, measure):
+        """Percentage change from the first row to the latest one."""
+        last = self.last(measure)
+        if self.first is None or not self.first[measure]:
+            return float('nan')
+        return (last - self.first[measure]) / self.first[measure] * 100
@@ -0,0 +1,88 @@
+"""Pre-aggregated sales totals by region and time bucket."""
+
+import numpy as np
+import pandas as pd
+
+from utils.sales_data import MEASURES
+
+
+class SalesCube:
+    """Sums of every measure plus row counts on a region x time-bucket grid.
+
+    The cube is built with one ``bincount`` pass per measure and can then
+    answer regional totals over any bucket range without touching the rows.
+    ``extend`` folds in newly arrived rows, widening the time axis when they
+    fall outside the buckets seen so far. Integer measures are summed exactly
+    as integers; once any measure arrives as floats the sums switch to
+    float64 so those totals keep their fractional part.
+    """
+
+    def __init__(self, regions, bucket='M'):
+        self.regions = list(regions)
+        self.bucket = bucket
+        self.start = None  # first bucket, as datetime64[bucket]
+        self.sums = np.zeros((len(self.regions), 0, len(MEASURES)), dtype=np.int64)
+        self.counts = np.zeros((len(self.regions), 0), dtype=np.int64)
+        self.floating = set()  # measures seen with a floating-point dtype
+
+    @classmethod
+    def from_frame(cls, df, regions, bucket='M'):
+        cube = cls(regions, bucket)
+        cube.extend(df)
+        return cube
+
+    def __len__(self):
+        return int(self.counts.sum())
+
+    def buckets(self):
+        return self.start + np.arange(self.counts.shape[1]) if self.start is not None else np.array([])
+
+    def extend(self, df):
+        """Add the rows of ``df`` to the running totals."""
+        if len(df) == 0:
+            return
+        region = pd.Categorical(df['Region'], categories=self.regions).codes.astype(np.int64)
+        if (region < 0).any():
+            raise ValueError("Rows contain regions outside the cube")
+        floating = {measure for measure in MEASURES if pd.api.types.is_float_dtype(df[measure])}
+        if floating - self.floating:
+            self.floating |= floating
+            self.sums = self.sums.astype(np.float64)
+        bucket = df['Date'].to_numpy().astype(f'datetime64[{self.bucket}]')
+        first, last = bucket.min(), bucket.max()
+
+        # Widen the time axis to cover the new rows
+        width = self.counts.shape[1]
+        start = first if self.start is None else min(self.start, first)
+        end = last if self.start is None or width == 0 else max(self.start + width - 1, last)
+        before = 0 if self.start is None else int((self.start - start).astype(np.int64))
+        after = int((end - start).astype(np.int64)) + 1 - width - before
+        if before or after:
+            self.sums = np.pad(self.sums, ((0, 0), (before, after), (0, 0)))
+            self.counts = np.pad(self.counts, ((0, 0), (before, after)))
+        self.start = start
+
+        width = self.counts.shape[1]
+        cell = region * width + (bucket - self.start).astype(np.int64)
+        size = len(self.regions) * width
+        self.counts += np.bincount(cell, minlength=size).reshape(-1, width)
+        for m, measure in enumerate(MEASURES):
+            totals = np.bincount(cell, weights=df[measure].to_numpy(), minlength=size)
+            if measure not in self.floating:
+                totals = np.rint(totals).astype(np.int64)
+            self.sums[:, :, m] += totals.reshape(-1, width)
+
+    def totals(self, start=None, end=None):
+        """Per-region totals over the buckets from ``start`` to ``end`` inclusive (default: all)."""
+        lo, hi = 0, self.counts.shape[1]
+        if self.start is not None:
+            if start is not None:
+                lo = max(int((np.datetime64(start, self.bucket) - self.start).astype(np.int64)), 0)
+            if end is not None:
+                hi = min(int((np.datetime64(end, self.bucket) - self.start).astype(np.int64)) + 1, hi)
+        hi = max(hi, lo)
+        result = pd.DataFrame(self.sums[:, lo:hi].sum(axis=1), columns=MEASURES)
+        result = result.astype({measure: np.int64 for measure in MEASURES if measure not in self.floating})
+        result.insert(0, 'Region', self.regions)
+        result['Rows'] = self.counts[:, lo:hi].sum(axis=1)
+        return result
@@ -0,0 +1,38 @@
+"""Synthetic sales data for the Charts & Data page."""
+
+import numpy as np
+import pandas as pd
+
+REGIONS = ['North', 'South', 'East', 'West']
+MEASURES = ['Sales', 'Profit', 'Customers']
+# One row per day for up to ten years; larger series sample the same span more finely
+MAX_SPAN = np.timedelta64(3650, 'D').astype('timedelta64[s]')
+# The upward trend grows per row up to this many rows, then is stretched over the series
+TREND_ROWS = 100
+
+
+def generate_sales(n_points, seed=None, end=None):
+    """Return ``n_points`` rows of Date, Sales, Profit, Customers and Region.
+
+    Every column is drawn in one vectorized call from a NumPy ``Generator``
+    seeded with ``seed``, so the same arguments always give the same frame.
+    ``end`` is the last timestamp (defaults to now).
+    """
+    rng = np.random.default_rng(seed)
+    end = np.datetime64(end if end is not None else pd.Timestamp.now(), 's')
+    step = min(np.timedelta64(86400, 's'), MAX_SPAN // max(n_points, 1))
+    dates = end - step * np.arange(n_points - 1, -1, -1)
+    trend = np.arange(n_points) * min(1.0, TREND_ROWS / max(n_points, 1))
+    columns = draw_sales(rng, n_points, trend)
+    columns['Region'] = pd.Categorical.from_codes(columns['Region'], REGIONS)
+    return pd.DataFrame({'Date': dates, **columns})
+
+
+def draw_sales(rng, n, trend=0):
+    """Draw ``n`` rows of the measures and region codes (indexes into REGIONS) from ``rng``."""
+    return {
+        'Sales': (rng.integers(1000, 5001, n) + trend * 10).astype(np.int32),
+        'Profit': (rng.integers(200, 1001, n) + trend * 5).astype(np.int32),
+        'Customers': (rng.integers(50, 201, n) + trend * 2).astype(np.int32),
+        'Region': rng.integers(0, len(REGIONS), n).astype(np.int8),
+    }
@@ -0,0 +1,134 @@
+"""Indexed region and Sales-range filtering for the Charts & Data table."""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Sales ranks are cut into this many blocks with a precomputed bitmap per boundary
+SALES_BLOCKS = 32
+RESULT_CACHE_SIZE = 32
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class RowSet:
+    """Rows selected by a filter, held as a packed bitmap over the frame."""
+
+    def __init__(self, bits, size):
+        self._bits = bits
+        self._size = size
+        self._count = int(_POPCOUNT[bits].sum(dtype=np.int64))
+        self._positions = None
+
+    def __len__(self):
+        return self._count
+
+    def head(self, n):
+        """Positions of the first ``n`` selected rows, unpacking only as much of the bitmap as needed."""
+        found = []
+        total = 0
+        step = max(n, 1 << 16)
+        for start in range(0, len(self._bits), step):
+            chunk = np.flatnonzero(np.unpackbits(self._bits[start:start + step])) + 8 * start
+            found.append(chunk)
+            total += len(chunk)
+            if total >= n:
+                break
+        return np.concatenate(found)[:n] if found else np.empty(0, dtype=np.int64)
+
+    def positions(self):
+        if self._positions is None:
+            self._positions = np.flatnonzero(np.unpackbits(self._bits, count=self._size))
+        return self._positions
+
+
+class SalesFilter:
+    """Answers ``region in regions and lo <= Sales <= hi`` without scanning the frame.
+
+    Sales is indexed by a stable argsort, so a range is found with two
+    ``searchsorted`` calls. The matching rows come from precomputed prefix
+    bitmaps: XOR two block boundaries, then scatter only the ranks at the
+    partial edges. Each region has its own packed bitmap, and the two
+    filters combine with bitwise AND. Results are memoized by filter key.
+    """
+
+    def __init__(self, df, regions):
+        self.size = len(df)
+        sales = df['Sales'].to_numpy()
+        self._order = np.argsort(sales, kind='stable')
+        self._sorted = sales[self._order]
+        info = np.iinfo(self._sorted.dtype) if self._sorted.dtype.kind in 'iu' else np.finfo(self._sorted.dtype)
+        self._limits = (info.min, info.max)
+        self._block = max(-(-self.size // SALES_BLOCKS), 1)
+
+        mask = np.zeros(self.size, dtype=bool)
+        self._prefix = [np.packbits(mask)]
+        for start in range(0, self.size, self._block):
+            mask[self._order[start:start + self._block]] = True
+            self._prefix.append(np.packbits(mask))
+
+        self._regions = {region: np.packbits((df['Region'] == region).to_numpy()) for region in regions}
+        self._results = OrderedDict()
+        self._lock = threading.Lock()  # shared across sessions
+
+    @property
+    def nbytes(self):
+        """Bytes held by the index, counting the result cache as full of bitmaps."""
+        arrays = [self._order, self._sorted, *self._prefix, *self._regions.values()]
+        return sum(array.nbytes for array in arrays) + RESULT_CACHE_SIZE * self._prefix[0].nbytes
+
+    def bounds(self):
+        """Smallest and largest Sales value, read off the sorted index."""
+        # .item() keeps float Sales as floats, so the table's default range includes the largest row
+        return (self._sorted[0].item(), self._sorted[-1].item()) if self.size else (0, 0)
+
+    def _range_bits(self, a, b):
+        # Rows whose Sales rank falls in [a, b)
+        ja, jb = -(-a // self._block), b // self._block
+        if ja > jb:
+            mask = np.zeros(self.size, dtype=bool)
+            mask[self._order[a:b]] = True
+            return np.packbits(mask)
+        bits = self._prefix[jb] ^ self._prefix[ja]
+        edges = np.concatenate([self._order[a:ja * self._block], self._order[jb * self._block:b]])
+        if len(edges):
+            mask = np.zeros(self.size, dtype=bool)
+            mask[edges] = True
+            bits |= np.packbits(mask)
+        return bits
+
+    def query(self, regions, sales_min, sales_max):
+        """Return the RowSet matching the selected regions and inclusive Sales range."""
+        key = (frozenset(regions), sales_min, sales_max)
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                return result
+
+        # Bounds take the index dtype, otherwise numpy upcasts the whole sorted column per lookup
+        bounds = np.array([sales_min, sales_max], dtype=np.float64)
+        if self._sorted.dtype.kind in 'iu':
+            # An integer index holds no values strictly between the bounds' floor and ceiling
+            bounds = np.array([np.ceil(bounds[0]), np.floor(bounds[1])])
+        bounds = np.clip(bounds, *self._limits).astype(self._sorted.dtype)
+        a = int(np.searchsorted(self._sorted, bounds[0], side='left'))
+        b = int(np.searchsorted(self._sorted, bounds[1], side='right'))
+        bits = self._range_bits(a, b)
+        region_bits = np.zeros_like(bits)
+        for region in key[0]:
+            if region in self._regions:
+                region_bits |= self._regions[region]
+        result = RowSet(bits & region_bits, self.size)
+
+        with self._lock:
+            self._results[key] = result
+            if len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Forget the memoized results."""
+        with self._lock:
+            self._results.clear()
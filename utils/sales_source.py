@@ -0,0 +1,118 @@
+"""Where the Charts & Data page gets its rows from.
+
+A source exposes a hashable ``version`` (used as the cache scope) and a
+``scan`` that returns only the requested columns and the rows matching the
+region and Sales-range predicates.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pyarrow import fs
+
+from utils.sales_data import MEASURES, REGIONS, generate_sales
+
+COLUMNS = ['Date', *MEASURES, 'Region']
+# File suffix -> pyarrow dataset format; directories are read as Parquet datasets
+FORMATS = {'.parquet': 'parquet', '.pq': 'parquet', '.arrow': 'ipc', '.feather': 'ipc', '.ipc': 'ipc'}
+
+
+def _is_text(arrow_type):
+    if pa.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    return pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type)
+
+
+# Arrow types each file column may have; everything else is rejected when the source is opened
+_SUPPORTED = {
+    'Date': lambda t: pa.types.is_timestamp(t) or pa.types.is_date(t),
+    **{m: lambda t: pa.types.is_integer(t) or pa.types.is_floating(t) for m in MEASURES},
+    'Region': _is_text,
+}
+
+
+def _finish(df):
+    # Common shape for every source: timezone-free datetime64 dates, known regions as a
+    # categorical, rows in time order
+    if 'Date' in df and not (pd.api.types.is_datetime64_dtype(df['Date']) and df['Date'].dt.tz is None):
+        dates = pd.to_datetime(df['Date'])
+        df['Date'] = dates.dt.tz_convert(None) if dates.dt.tz is not None else dates
+    if 'Region' in df:
+        df['Region'] = pd.Categorical(df['Region'], categories=REGIONS)
+    if 'Date' in df and not df['Date'].is_monotonic_increasing:
+        df = df.sort_values('Date', kind='stable', ignore_index=True)
+    return df
+
+
+class GeneratedSales:
+    """The synthetic data set from utils.sales_data."""
+
+    def __init__(self, n_points, seed, end):
+        self.version = ('generated', n_points, seed, end)
+        self._args = (n_points, seed, end)
+
+    def scan(self, columns=COLUMNS, regions=None, sales_min=None, sales_max=None):
+        n_points, seed, end = self._args
+        df = generate_sales(n_points, seed=seed, end=end)
+        mask = np.ones(len(df), dtype=bool)
+        if regions is not None:
+            mask &= df['Region'].isin(regions).to_numpy()
+        if sales_min is not None:
+            mask &= (df['Sales'] >= sales_min).to_numpy()
+        if sales_max is not None:
+            mask &= (df['Sales'] <= sales_max).to_numpy()
+        return _finish(df.loc[mask, columns].reset_index(drop=True) if not mask.all() else df[columns])
+
+
+class ArrowFileSales:
+    """A local Parquet or Arrow IPC file (or a directory of Parquet files).
+
+    Files are opened through a memory-mapping filesystem. The column
+    projection and the region and Sales predicates are handed to the
+    pyarrow dataset scanner, so Parquet row groups whose statistics rule
+    them out are skipped and unused columns are never read.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path).expanduser()
+        if not self.path.exists():
+            raise FileNotFoundError(f"No such file or directory: {self.path}")
+        if self.path.is_dir():
+            files, fmt = sorted(p for p in self.path.rglob('*') if p.is_file()), 'parquet'
+        else:
+            files, fmt = [self.path], FORMATS.get(self.path.suffix.lower())
+            if fmt is None:
+                raise ValueError(f"Unsupported file type '{self.path.suffix}'; use one of {', '.join(FORMATS)}")
+        self._dataset = ds.dataset(str(self.path), format=fmt, filesystem=fs.LocalFileSystem(use_mmap=True))
+        schema = self._dataset.schema
+        missing = [col for col in COLUMNS if col not in schema.names]
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(missing)}")
+        unsupported = [f"{col} ({schema.field(col).type})" for col in COLUMNS
+                       if not _SUPPORTED[col](schema.field(col).type)]
+        if unsupported:
+            raise ValueError(f"Unsupported column types: {', '.join(unsupported)}; Date must be a date or "
+                             "timestamp, the measures integers or floats, and Region a string")
+        self._floating = [m for m in MEASURES if pa.types.is_floating(schema.field(m).type)]
+        # Rewriting any file changes the version, and with it every cache key for this source
+        stats = [p.stat() for p in files]
+        self.version = ('file', str(self.path.resolve()),
+                        max((s.st_mtime_ns for s in stats), default=0), sum(s.st_size for s in stats))
+
+    def scan(self, columns=COLUMNS, regions=None, sales_min=None, sales_max=None):
+        # Rows outside the known regions, or missing a date or a measure, are never loaded
+        predicate = pc.field('Region').isin(list(regions) if regions is not None else REGIONS)
+        for col in ['Date', *MEASURES]:
+            predicate &= pc.field(col).is_valid()
+        for col in self._floating:
+            predicate &= ~pc.field(col).is_nan()
+        if sales_min is not None:
+            predicate &= pc.field('Sales') >= sales_min
+        if sales_max is not None:
+            predicate &= pc.field('Sales') <= sales_max
+        table = self._dataset.to_table(columns=list(columns), filter=predicate)
+        return _finish(table.to_pandas())
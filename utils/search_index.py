@@ -0,0 +1,219 @@
+"""Incrementally maintained trigram index for substring and fuzzy search.
+
+Documents are indexed by the trigrams of their lower-cased fields. The bulk of
+the postings live in compact sorted NumPy arrays (one slice of document
+numbers per trigram); documents added afterwards go into a small in-memory
+delta that is merged back into the arrays once it grows large enough. Deleted
+or edited documents are tombstoned and dropped on the next merge.
+"""
+
+from collections import defaultdict
+
+import numpy as np
+
+N = 3
+_BITS = 21  # enough for any unicode code point
+_MASK = (1 << _BITS) - 1
+
+# Rebuild the compact postings once the delta or the tombstones reach this share of the index
+MERGE_RATIO = 0.1
+MERGE_MIN_DOCS = 1000
+BUILD_CHUNK = 100_000
+
+
+def normalize(fields):
+    """Lower-case the fields and pad each with spaces so word boundaries form trigrams.
+
+    Fields are separated by ``\\x00`` so no trigram (and no match) spans two fields.
+    """
+    return "\x00".join(f" {str(field).lower()} " for field in fields)
+
+
+def _gram_codes(text):
+    return {
+        (ord(a) << 2 * _BITS) | (ord(b) << _BITS) | ord(c)
+        for a, b, c in zip(text, text[1:], text[2:])
+        if "\x00" not in (a, b, c)
+    }
+
+
+def _contains(text, fragment):
+    if fragment[0] == " " or fragment[-1] == " ":
+        # Leave out the padding so leading/trailing spaces only match real ones
+        return any(fragment in field[1:-1] for field in text.split("\x00"))
+    return fragment in text
+
+
+def _bulk_pairs(texts, first_docno):
+    # Vectorized trigram extraction: one code per trigram, tagged with its document number
+    joined = "\x00".join(texts) + "\x00"
+    cp = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)) + 1
+    docs = np.repeat(np.arange(first_docno, first_docno + len(texts), dtype=np.int64), lengths)[:-2]
+    codes = (cp[:-2] << 2 * _BITS) | (cp[1:-1] << _BITS) | cp[2:]
+    valid = (cp[:-2] != 0) & (cp[1:-1] != 0) & (cp[2:] != 0)
+    codes, docs = codes[valid], docs[valid]
+    order = np.lexsort((docs, codes))
+    codes, docs = codes[order], docs[order]
+    keep = np.ones(len(codes), dtype=bool)
+    keep[1:] = (codes[1:] != codes[:-1]) | (docs[1:] != docs[:-1])
+    return codes[keep], docs[keep]
+
+
+class TrigramIndex:
+    """Trigram index mapping external document keys to their searchable text."""
+
+    def __init__(self):
+        self._keys = []
+        self._texts = []
+        self._docno = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._grams = np.empty(0, dtype=np.int64)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._postings = np.empty(0, dtype=np.int64)
+        self._base_docs = 0
+        self._delta = defaultdict(list)
+        self._dead = 0
+
+    def __len__(self):
+        return len(self._docno)
+
+    def __contains__(self, key):
+        return key in self._docno
+
+    # Maintenance
+
+    def build(self, keys, rows):
+        """Replace the index contents with ``keys`` and their field tuples ``rows``."""
+        self._keys = list(keys)
+        self._texts = [normalize(fields) for fields in rows]
+        self._rebuild()
+
+    def add(self, key, fields):
+        if key in self._docno:
+            self.remove(key)
+        docno = len(self._keys)
+        text = normalize(fields)
+        self._keys.append(key)
+        self._texts.append(text)
+        self._docno[key] = docno
+        if docno >= len(self._alive):
+            self._alive = np.concatenate([self._alive, np.zeros(max(docno, 16), dtype=bool)])
+        self._alive[docno] = True
+        for code in _gram_codes(text):
+            self._delta[code].append(docno)
+        self._maybe_merge()
+
+    def update(self, key, fields):
+        self.add(key, fields)
+
+    def remove(self, key):
+        docno = self._docno.pop(key, None)
+        if docno is None:
+            return
+        self._alive[docno] = False
+        self._texts[docno] = None
+        self._dead += 1
+        self._maybe_merge()
+
+    def _maybe_merge(self):
+        pending = len(self._keys) - self._base_docs + self._dead
+        if pending > max(MERGE_MIN_DOCS, MERGE_RATIO * self._base_docs):
+            live = [docno for docno in range(len(self._keys)) if self._texts[docno] is not None]
+            self._keys = [self._keys[docno] for docno in live]
+            self._texts = [self._texts[docno] for docno in live]
+            self._rebuild()
+
+    def _rebuild(self):
+        size = len(self._keys)
+        self._docno = {key: docno for docno, key in enumerate(self._keys)}
+        self._alive = np.ones(size, dtype=bool)
+        parts = [_bulk_pairs(self._texts[start:start + BUILD_CHUNK], start)
+                 for start in range(0, size, BUILD_CHUNK)]
+        if parts:
+            codes = np.concatenate([codes for codes, _ in parts])
+            docs = np.concatenate([docs for _, docs in parts])
+            # Chunks are already in document order, so a stable sort keeps each posting list sorted
+            order = np.argsort(codes, kind="stable")
+            codes, docs = codes[order], docs[order]
+        else:
+            codes = docs = np.empty(0, dtype=np.int64)
+        self._grams, starts = np.unique(codes, return_index=True)
+        self._offsets = np.append(starts, len(codes)).astype(np.int64)
+        self._postings = docs
+        self._base_docs = size
+        self._delta.clear()
+        self._dead = 0
+
+    # Lookups
+
+    def _lookup(self, code):
+        i = np.searchsorted(self._grams, code)
+        if i < len(self._grams) and self._grams[i] == code:
+            base = self._postings[self._offsets[i]:self._offsets[i + 1]]
+        else:
+            base = self._postings[:0]
+        delta = self._delta.get(code)
+        if delta:
+            # Delta documents are numbered after every base document, so the result stays sorted
+            return np.concatenate([base, np.asarray(delta, dtype=np.int64)])
+        return base
+
+    def _containing(self, fragment):
+        # Queries shorter than a trigram: union the postings of every trigram containing them
+        chars = [ord(ch) for ch in fragment]
+
+        def matches(c0, c1, c2):
+            if len(chars) == 1:
+                return (c0 == chars[0]) | (c1 == chars[0]) | (c2 == chars[0])
+            return ((c0 == chars[0]) & (c1 == chars[1])) | ((c1 == chars[0]) & (c2 == chars[1]))
+
+        grams = self._grams
+        idx = np.flatnonzero(matches(grams >> 2 * _BITS, (grams >> _BITS) & _MASK, grams & _MASK))
+        starts = self._offsets[idx]
+        lengths = self._offsets[idx + 1] - starts
+        gather = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        found = [self._postings[gather]]
+        for code, docs in self._delta.items():
+            if matches(code >> 2 * _BITS, (code >> _BITS) & _MASK, code & _MASK):
+                found.append(np.asarray(docs, dtype=np.int64))
+        return np.unique(np.concatenate(found))
+
+    def search(self, query):
+        """Return the keys of documents containing ``query`` as a substring, in insertion order."""
+        fragment = query.lower()
+        if not fragment:
+            return list(self._docno)
+        if "\x00" in fragment:
+            return []
+
+        if len(fragment) >= N:
+            postings = sorted((self._lookup(code) for code in _gram_codes(fragment)), key=len)
+            candidates = postings[0]
+            for other in postings[1:]:
+                if not len(candidates):
+                    break
+                candidates = np.intersect1d(candidates, other, assume_unique=True)
+        else:
+            candidates = self._containing(fragment)
+        candidates = candidates[self._alive[candidates]]
+
+        # Trigram hits are exact for space-free fragments up to a trigram long;
+        # anything longer has to be confirmed against the text
+        if len(fragment) > N or " " in fragment:
+            candidates = [docno for docno in candidates if _contains(self._texts[docno], fragment)]
+        return [self._keys[docno] for docno in candidates]
+
+    def fuzzy_search(self, query, threshold=0.2, limit=None):
+        """Return ``(key, similarity)`` pairs ranked by the share of query trigrams each document contains."""
+        codes = _gram_codes(normalize([query]))
+        if not codes:
+            return []
+        hits = np.concatenate([self._lookup(code) for code in codes])
+        docs, counts = np.unique(hits, return_counts=True)
+        live = self._alive[docs]
+        docs, scores = docs[live], counts[live] / len(codes)
+        keep = scores >= threshold
+        docs, scores = docs[keep], scores[keep]
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return [(self._keys[docs[i]], float(scores[i])) for i in order]
@@ -1,8 +1,11 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime, date
 import uuid
-import time
+from functools import partial
+from utils.employee_import import REQUIRED_COLUMNS, import_employees
+from utils.employee_store import DEPARTMENTS, STATUSES, get_employee_store
+from utils.export import EXPORT_FORMATS, cached_export, iter_frame_chunks
+from utils.notifications import flash, show_flashes
 
 # Custom CSS for CRUD interface
 st.markdown("""
@@ -72,18 +75,11 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialize session state for data storage
-if 'employees' not in st.session_state:
-    st.session_state.employees = pd.DataFrame({
-        'id': [str(uuid.uuid4())[:8] for _ in range(5)],
-        'name': ['Alice Johnson', 'Bob Smith', 'Carol Davis', 'David Wilson', 'Eva Brown'],
-        'email': ['alice@company.com', 'bob@company.com', 'carol@company.com', 'david@company.com', 'eva@company.com'],
-        'department': ['Engineering', 'Marketing', 'Sales', 'Engineering', 'HR'],
-        'position': ['Senior Developer', 'Marketing Manager', 'Sales Rep', 'DevOps Engineer', 'HR Specialist'],
-        'salary': [95000, 75000, 65000, 88000, 70000],
-        'hire_date': [date(2020, 1, 15), date(2021, 3, 10), date(2019, 8, 22), date(2022, 5, 5), date(2021, 11, 30)],
-        'status': ['Active', 'Active', 'Active', 'Active', 'Active']
-    })
+# Employee data lives in a process-wide store shared by every session
+store = get_employee_store()
+
+# Show messages queued by the action that triggered this rerun
+show_flashes()
 
 if 'search_query' not in st.session_state:
     st.session_state.search_query = ""
@@ -93,6 +89,16 @@ if 'editing_id' not in st.session_state:
     st.session_state.editing_id = None
 if 'show_add_form' not in st.session_state:
     st.session_state.show_add_form = False
+if 'page_number' not in st.session_state:
+    st.session_state.page_number = 1
+if 'page_size' not in st.session_state:
+    st.session_state.page_size = 25
+if 'list_filters' not in st.session_state:
+    st.session_state.list_filters = None
+if 'import_report' not in st.session_state:
+    st.session_state.import_report = None
+
+PAGE_SIZES = [10, 25, 50, 100]
 
 # Page header
 st.markdown("""
@@ -105,44 +111,49 @@ st.markdown("""
 # Statistics Dashboard Fragment
 @st.fragment
 def display_stats():
-    df = st.session_state.employees
+    stats = store.stats()
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.markdown(f"""
         <div class="stats-container">
-            <h3>{len(df)}</h3>
+            <h3>{stats['total']}</h3>
             <p>Total Employees</p>
         </div>
         """, unsafe_allow_html=True)
     
     with col2:
-        active_count = len(df[df['status'] == 'Active'])
         st.markdown(f"""
         <div class="stats-container">
-            <h3>{active_count}</h3>
+            <h3>{stats['active']}</h3>
             <p>Active Employees</p>
         </div>
         """, unsafe_allow_html=True)
     
     with col3:
-        avg_salary = df['salary'].mean()
         st.markdown(f"""
         <div class="stats-container">
-            <h3>${avg_salary:,.0f}</h3>
+            <h3>${stats['avg_salary']:,.0f}</h3>
             <p>Average Salary</p>
         </div>
         """, unsafe_allow_html=True)
     
     with col4:
-        dept_count = df['department'].nunique()
         st.markdown(f"""
         <div class="stats-container">
-            <h3>{dept_count}</h3>
+            <h3>{stats['departments']}</h3>
             <p>Departments</p>
         </div>
         """, unsafe_allow_html=True)
+    
+    # Append ?debug=1 to the URL to cross-check the running totals against a full recount
+    if st.query_params.get("debug") == "1":
+        mismatches = store.check_aggregates()
+        if mismatches:
+            st.error("❌ Stats drifted from the roster: " + "; ".join(mismatches))
+        else:
+            st.caption("✅ Stats verified against a full recount")
 
 # Search and Filter Fragment
 @st.fragment
@@ -164,9 +175,13 @@ def search_and_filter():
         )
         if search_query != st.session_state.search_query:
             st.session_state.search_query = search_query
+        fuzzy = st.checkbox("Typo-tolerant matching", key="fuzzy_search",
+                            help="Rank employees by similarity instead of requiring an exact substring")
     
     with col2:
-        departments = ['All'] + sorted(st.session_state.employees['department'].unique().tolist())
+        departments = ['All'] + store.departments()
+        if st.session_state.selected_department not in departments:
+            st.session_state.selected_department = "All"
         selected_dept = st.selectbox(
             "Department",
             departments,
@@ -183,7 +198,7 @@ def search_and_filter():
             key="status_filter"
         )
     
-    return search_query, selected_dept, status_filter
+    return search_query, selected_dept, status_filter, fuzzy
 
 # Add Employee Form Fragment
 @st.fragment
@@ -197,8 +212,7 @@ def add_employee_form():
             with col1:
                 name = st.text_input("Full Name*", placeholder="Enter full name")
                 email = st.text_input("Email*", placeholder="employee@company.com")
-                department = st.selectbox("Department*", 
-                                        ["Engineering", "Marketing", "Sales", "HR", "Finance", "Operations"])
+                department = st.selectbox("Department*", DEPARTMENTS)
             
             with col2:
                 position = st.text_input("Position*", placeholder="Job title")
@@ -226,13 +240,10 @@ def add_employee_form():
                         'status': 'Active'
                     }
                     
-                    # Add to dataframe
-                    new_row = pd.DataFrame([new_employee])
-                    st.session_state.employees = pd.concat([st.session_state.employees, new_row], ignore_index=True)
+                    store.insert(new_employee)
                     
-                    st.success(f"✅ Employee {name} added successfully!")
+                    flash(f"Employee {name} added successfully!", icon="✅")
                     st.session_state.show_add_form = False
-                    time.sleep(1)
                     st.rerun()
                 else:
                     st.error("❌ Please fill in all required fields marked with *")
@@ -245,7 +256,11 @@ def add_employee_form():
 @st.fragment
 def edit_employee_form():
     if st.session_state.editing_id:
-        employee = st.session_state.employees[st.session_state.employees['id'] == st.session_state.editing_id].iloc[0]
+        employee = store.get(st.session_state.editing_id)
+        if employee is None:
+            # Removed by another user since the edit was opened
+            st.session_state.editing_id = None
+            return
         
         st.markdown(f"### ✏️ Edit Employee: {employee['name']}")
         
@@ -255,15 +270,14 @@ def edit_employee_form():
             with col1:
                 name = st.text_input("Full Name", value=employee['name'])
                 email = st.text_input("Email", value=employee['email'])
-                department = st.selectbox("Department", 
-                                        ["Engineering", "Marketing", "Sales", "HR", "Finance", "Operations"],
-                                        index=["Engineering", "Marketing", "Sales", "HR", "Finance", "Operations"].index(employee['department']))
+                department = st.selectbox("Department", DEPARTMENTS,
+                                        index=DEPARTMENTS.index(employee['department']))
             
             with col2:
                 position = st.text_input("Position", value=employee['position'])
                 salary = st.number_input("Salary", min_value=30000, max_value=200000, value=int(employee['salary']), step=5000)
-                status = st.selectbox("Status", ["Active", "Inactive"], 
-                                    index=0 if employee['status'] == 'Active' else 1)
+                status = st.selectbox("Status", STATUSES, 
+                                    index=STATUSES.index(employee['status']))
             
             col1, col2, col3 = st.columns([1, 1, 2])
             
@@ -275,56 +289,85 @@ def edit_employee_form():
             
             if updated:
                 # Update the employee record
-                idx = st.session_state.employees[st.session_state.employees['id'] == st.session_state.editing_id].index[0]
-                st.session_state.employees.loc[idx, 'name'] = name
-                st.session_state.employees.loc[idx, 'email'] = email
-                st.session_state.employees.loc[idx, 'department'] = department
-                st.session_state.employees.loc[idx, 'position'] = position
-                st.session_state.employees.loc[idx, 'salary'] = salary
-                st.session_state.employees.loc[idx, 'status'] = status
+                store.update(st.session_state.editing_id, {
+                    'name': name,
+                    'email': email,
+                    'department': department,
+                    'position': position,
+                    'salary': salary,
+                    'status': status
+                })
                 
-                st.success(f"✅ Employee {name} updated successfully!")
+                flash(f"Employee {name} updated successfully!", icon="✅")
                 st.session_state.editing_id = None
-                time.sleep(1)
                 st.rerun()
             
             if cancelled:
                 st.session_state.editing_id = None
                 st.rerun()
 
+# Bulk Import Fragment
+@st.fragment
+def bulk_import_section():
+    with st.expander("📥 Bulk Import", expanded=st.session_state.import_report is not None):
+        st.caption(f"Upload a CSV or Parquet file with the columns {', '.join(REQUIRED_COLUMNS)} "
+                   "and optionally id and status.")
+        
+        report = st.session_state.import_report
+        if report is not None:
+            file_name, inserted, errors = report
+            st.success(f"✅ Imported {inserted:,} employees from {file_name}")
+            if len(errors):
+                st.warning(f"⚠️ {len(errors):,} rows were rejected")
+                st.dataframe(errors.head(1000), hide_index=True, use_container_width=True)
+                st.download_button(
+                    label="📥 Download Error Report",
+                    data=errors.to_csv(index=False),
+                    file_name=f'import_errors_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
+                    mime='text/csv'
+                )
+        
+        upload = st.file_uploader("Employee file", type=["csv", "parquet"], key="import_file")
+        if upload is not None and st.button("⬆️ Import", type="primary"):
+            try:
+                with st.spinner(f"Importing {upload.name}..."):
+                    inserted, errors = import_employees(store, upload, upload.name)
+            except ValueError as exc:
+                st.error(f"❌ {exc}")
+            else:
+                st.session_state.import_report = (upload.name, inserted, errors)
+                st.rerun()
+
 # Employee List Fragment
 @st.fragment
 def display_employee_list():
-    df = st.session_state.employees.copy()
-    
     # Apply filters
-    search_query, selected_dept, status_filter = search_and_filter()
-    
-    # Filter by search query
-    if search_query:
-        mask = (
-            df['name'].str.contains(search_query, case=False, na=False) |
-            df['email'].str.contains(search_query, case=False, na=False) |
-            df['position'].str.contains(search_query, case=False, na=False)
-        )
-        df = df[mask]
-    
-    # Filter by department
-    if selected_dept != "All":
-        df = df[df['department'] == selected_dept]
+    search_query, selected_dept, status_filter, fuzzy = search_and_filter()
+    positions = store.query(search_query, selected_dept, status_filter, fuzzy)
+    total = len(positions)
     
-    # Filter by status
-    if status_filter != "All":
-        df = df[df['status'] == status_filter]
+    st.markdown(f"### 📋 Employee List ({total} records)")
     
-    st.markdown(f"### 📋 Employee List ({len(df)} records)")
+    # Go back to the first page whenever the filters change
+    filters = (search_query, selected_dept, status_filter, fuzzy)
+    if filters != st.session_state.list_filters:
+        st.session_state.list_filters = filters
+        st.session_state.page_number = 1
+    st.session_state.setdefault('page_size', 25)
     
-    if len(df) == 0:
+    if total == 0:
         st.info("🔍 No employees found matching your search criteria.")
         return
     
+    total_pages = max(1, -(-total // st.session_state.page_size))
+    st.session_state.page_number = min(st.session_state.page_number, total_pages)
+    
+    # Only the rows on the current page are materialized from the store
+    start = (st.session_state.page_number - 1) * st.session_state.page_size
+    page = store.take(positions[start:start + st.session_state.page_size])
+    
     # Display employees in a more interactive way
-    for idx, employee in df.iterrows():
+    for idx, employee in page.iterrows():
         with st.container():
             col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
             
@@ -340,7 +383,7 @@ def display_employee_list():
                 st.markdown(f"""
                 🏢 **{employee['department']}**  
                 💰 ${employee['salary']:,}  
-                📅 {employee['hire_date']}
+                📅 {employee['hire_date']:%Y-%m-%d}
                 """)
             
             with col3:
@@ -351,12 +394,53 @@ def display_employee_list():
             
             with col4:
                 if st.button(f"🗑️ Delete", key=f"delete_{employee['id']}", help="Delete employee"):
-                    st.session_state.employees = st.session_state.employees[st.session_state.employees['id'] != employee['id']]
-                    st.success(f"✅ Employee {employee['name']} deleted successfully!")
-                    time.sleep(1)
+                    store.delete(employee['id'])
+                    flash(f"Employee {employee['name']} deleted successfully!", icon="✅")
                     st.rerun()
             
             st.divider()
+    
+    pagination_controls(total, total_pages, start, len(page))
+
+def _change_page(step):
+    st.session_state.page_number += step
+
+def _sync_page_setting(name):
+    # Copy a pagination widget back into its persistent key
+    st.session_state[name] = st.session_state[f"{name}_input"]
+
+def pagination_controls(total, total_pages, start, shown):
+    col1, col2, col3, col4, col5 = st.columns([1, 1, 1, 1, 2])
+    
+    with col1:
+        st.button("⬅️ Previous", on_click=_change_page, args=(-1,),
+                  disabled=st.session_state.page_number <= 1)
+    
+    with col2:
+        st.button("Next ➡️", on_click=_change_page, args=(1,),
+                  disabled=st.session_state.page_number >= total_pages)
+    
+    # The settings live under plain keys, which Streamlit keeps when the widgets are not rendered
+    # (e.g. while a search matches nothing); the widgets are seeded from them on every run
+    st.session_state.page_number_input = st.session_state.page_number
+    st.session_state.page_size_input = st.session_state.page_size
+    
+    with col3:
+        st.number_input("Jump to page", min_value=1, max_value=total_pages, step=1, key="page_number_input",
+                        on_change=_sync_page_setting, args=("page_number",))
+    
+    with col4:
+        st.selectbox("Rows per page", PAGE_SIZES, key="page_size_input",
+                     on_change=_sync_page_setting, args=("page_size",))
+    
+    with col5:
+        st.caption(f"Showing {start + 1}–{start + shown} of {total} · page "
+                   f"{st.session_state.page_number} of {total_pages}")
+
+def export_roster(fmt):
+    # Runs on click: the version and the roster it describes are read together
+    version, roster = store.snapshot()
+    return cached_export(("employees", version), fmt, lambda: iter_frame_chunks(roster))
 
 # Main layout
 display_stats()
@@ -364,7 +448,7 @@ display_stats()
 st.markdown("---")
 
 # Action buttons
-col1, col2, col3 = st.columns([1, 1, 4])
+col1, col2, col3, col4 = st.columns([1, 1, 1, 3])
 
 with col1:
     if st.button("➕ Add Employee", type="primary"):
@@ -373,16 +457,22 @@ with col1:
         st.rerun()
 
 with col2:
-    if st.button("📊 Export CSV"):
-        csv = st.session_state.employees.to_csv(index=False)
-        st.download_button(
-            label="📥 Download CSV",
-            data=csv,
-            file_name=f'employees_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
-            mime='text/csv'
-        )
+    export_format = st.selectbox("Export format", list(EXPORT_FORMATS), key="export_format",
+                                 label_visibility="collapsed")
+
+with col3:
+    # The export is only built when clicked, and reused until the roster changes
+    extension, mime = EXPORT_FORMATS[export_format]
+    st.download_button(
+        label="📊 Export",
+        data=partial(export_roster, export_format),
+        file_name=f'employees_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{extension}',
+        mime=mime,
+        on_click="ignore"
+    )
 
 # Forms section
+bulk_import_section()
 add_employee_form()
 edit_employee_form()
 
@@ -1,8 +1,35 @@
+import os
 import pandas as pd
 import streamlit as st
 import numpy as np
-from datetime import datetime, timedelta
-import random
+from datetime import date, datetime
+from functools import partial
+from utils.cache import cache_namespace
+from utils.downsample import bin2d, lttb
+from utils.export import EXPORT_FORMATS, cached_export, iter_frame_chunks
+from utils.live_feed import get_live_feed
+from utils.rolling_stats import MAX_WINDOW, RollingStats
+from utils.sales_cube import SalesCube
+from utils.sales_data import MEASURES, REGIONS
+from utils.sales_filter import SalesFilter
+from utils.sales_source import COLUMNS, ArrowFileSales, GeneratedSales
+
+DATA_POINT_OPTIONS = [10, 25, 50, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000,
+                      500_000, 1_000_000, 2_000_000, 5_000_000]
+# Rows sent to the interactive table; the filters and the download still cover every row
+TABLE_ROWS = 10_000
+# Points per series sent to the line and area charts: roughly one per pixel of a
+# full-width chart, since Streamlit does not tell the script how wide a chart is
+CHART_POINTS = 1_500
+# Windows up to this size may be drawn unreduced
+RAW_MAX_POINTS = 50_000
+# Byte budgets per cached function: loaded frames, and the per-row series and indexes built from them.
+# A value larger than its budget is returned without being kept
+SALES_FRAME_CACHE_BYTES = 384 * 1024 * 1024
+SALES_DERIVED_CACHE_BYTES = 192 * 1024 * 1024
+# Live stream: seconds between chart updates and how many recent rows the chart shows
+LIVE_TICK_SECONDS = 1
+LIVE_WINDOW = 2_000
 
 # Custom CSS for this page
 st.markdown("""
@@ -48,87 +75,235 @@ st.sidebar.markdown("# 📊 Chart Controls")
 st.sidebar.markdown("Customize your data visualization experience")
 
 # Data generation controls
-data_points = st.sidebar.slider("Number of data points", 10, 100, 50)
+if 'sales_seed' not in st.session_state:
+    st.session_state.sales_seed = 42
+
+def new_seed():
+    st.session_state.sales_seed = int(np.random.default_rng().integers(1_000_000))
+
+def _sync_seed():
+    # The widget's own key is dropped on runs that do not show it, e.g. while a file is the source
+    st.session_state.sales_seed = st.session_state.sales_seed_input
+
+def amount(value):
+    # Integer measures print as whole numbers, float measures (e.g. from a file) with cents
+    return f"{value:,}" if isinstance(value, (int, np.integer)) else f"{value:,.2f}"
+
+source_kind = st.sidebar.radio("Data source", ["Generated", "Parquet / Arrow file"], horizontal=True)
+if source_kind == "Generated":
+    data_points = st.sidebar.select_slider(
+        "Number of data points",
+        options=DATA_POINT_OPTIONS,
+        value=50,
+        format_func=lambda n: f"{n:,}"
+    )
+    st.session_state.sales_seed_input = st.session_state.sales_seed
+    st.sidebar.number_input("Random seed", min_value=0, step=1, key="sales_seed_input", on_change=_sync_seed)
+    seed = st.session_state.sales_seed
+else:
+    dataset_path = st.sidebar.text_input(
+        "Dataset path", value=os.environ.get("SALES_DATASET_PATH", ""),
+        help="A .parquet, .arrow or .feather file, or a directory of Parquet files, "
+             "with Date, Sales, Profit, Customers and Region columns"
+    )
+    # Applied while scanning the file, so rows outside them are never loaded
+    load_regions = st.sidebar.multiselect("Load regions", REGIONS, default=REGIONS)
+    load_sales_min = st.sidebar.number_input("Load Sales from", value=None, step=100)
+    load_sales_max = st.sidebar.number_input("Load Sales up to", value=None, step=100)
 chart_type = st.sidebar.selectbox(
     "Select chart type",
     ["Line Chart", "Bar Chart", "Area Chart", "Scatter Plot", "All Charts"]
 )
+scatter_max_points = st.sidebar.number_input(
+    "Scatter density view above (points)", min_value=1_000, value=20_000, step=1_000,
+    help="Larger data sets are drawn as a heatmap of point counts instead of individual points"
+)
+density_bins = st.sidebar.select_slider("Density grid resolution", options=[25, 50, 100, 200], value=50)
+delta_window = st.sidebar.number_input(
+    "Delta window (rows)", min_value=1, max_value=MAX_WINDOW, value=1,
+    help="Sales and Customers deltas compare the latest rows with the same number before them"
+)
+trend_window = st.sidebar.number_input(
+    "Trend window (rows)", min_value=1, max_value=MAX_WINDOW, value=5,
+    help="Avg Profit change compares the mean of the latest rows with the window before"
+)
+live_mode = st.sidebar.toggle("📡 Live streaming", help="Follow a stream of sales rows produced in the background")
+
+# Cached results for this page, scoped by dataset version so one data set can be
+# dropped without touching the others
+sales_cache = cache_namespace("sales")
+
+# Load the data set; only the columns the page uses and the rows the load filters keep
+@sales_cache.cached(ttl=3600, max_entries=8, max_bytes=SALES_FRAME_CACHE_BYTES)
+def load_sales_data(dataset_version, _source):
+    _, regions, sales_min, sales_max = dataset_version
+    return _source.scan(COLUMNS, regions=regions, sales_min=sales_min, sales_max=sales_max)
+
+if source_kind == "Generated":
+    # The series ends today, so the cache key only changes once a day
+    source = GeneratedSales(data_points, seed, date.today())
+    load_filters = (None, None, None)
+else:
+    if not dataset_path:
+        st.info("📂 Enter the path of a local Parquet or Arrow dataset in the sidebar.")
+        st.stop()
+    try:
+        source = ArrowFileSales(dataset_path)
+    except (OSError, ValueError) as e:
+        st.error(f"❌ Could not open the dataset: {e}")
+        st.stop()
+    load_filters = (tuple(load_regions), load_sales_min, load_sales_max)
+
+dataset_version = (source.version, *load_filters)
+df = load_sales_data(dataset_version, source)
+if len(df) < 2:
+    st.warning("⚠️ The data set has fewer than two rows after the load filters.")
+    st.stop()
+dates = df['Date'].to_numpy()
+
+@sales_cache.cached(ttl=3600, max_entries=64)
+def downsampled_rows(dataset_version, columns, target_points, window, _dates, _values):
+    # LTTB per series, then the union of the picks, so every series shares one set of x-positions
+    # (a stacked area chart would otherwise fill the other series' missing positions with 0)
+    lo, hi = window
+    per_series = max(target_points // len(columns), 3)
+    return lo + np.unique(np.concatenate([lttb(_dates[lo:hi].astype(np.int64), _values[column][lo:hi], per_series)
+                                          for column in columns]))
+
+@sales_cache.cached(ttl=3600, max_entries=8)
+def rolling_stats(dataset_version, _df):
+    # Totals and trailing windows for the KPI cards; windows are picked at read time
+    return RollingStats.from_frame(_df, MEASURES)
 
-# Generate sample data
-@st.cache_data
-def generate_sample_data(n_points):
-    dates = [datetime.now() - timedelta(days=x) for x in range(n_points, 0, -1)]
-    
-    # Sales data
-    sales_data = {
-        'Date': dates,
-        'Sales': [random.randint(1000, 5000) + i*10 for i in range(n_points)],
-        'Profit': [random.randint(200, 1000) + i*5 for i in range(n_points)],
-        'Customers': [random.randint(50, 200) + i*2 for i in range(n_points)],
-        'Region': [random.choice(['North', 'South', 'East', 'West']) for _ in range(n_points)]
+@sales_cache.cached(ttl=3600, max_entries=8)
+def sales_cube(dataset_version, _df):
+    # Region x month totals, built once per data set. The cached cube is shared between sessions and
+    # never extended; a new data set gets a new cube under its own version.
+    return SalesCube.from_frame(_df, REGIONS)
+
+@sales_cache.cached(ttl=3600, max_entries=4, max_bytes=SALES_DERIVED_CACHE_BYTES)
+def sales_filter(dataset_version, _df):
+    # Sorted Sales index and region bitmaps for the interactive table
+    return SalesFilter(_df, REGIONS)
+
+@sales_cache.cached(ttl=3600, max_entries=8, max_bytes=SALES_DERIVED_CACHE_BYTES)
+def cumulative_series(dataset_version, _df):
+    return {
+        'Cumulative_Sales': _df['Sales'].cumsum().to_numpy(),
+        'Cumulative_Profit': _df['Profit'].cumsum().to_numpy()
     }
-    
-    return pd.DataFrame(sales_data)
 
-# Generate data
-df = generate_sample_data(data_points)
+@sales_cache.cached(ttl=3600, max_entries=8)
+def sales_profit_correlation(dataset_version, _df):
+    return float(_df['Sales'].corr(_df['Profit']))
+
+@sales_cache.cached(ttl=3600, max_entries=16)
+def density_grid(dataset_version, bins, _df):
+    return bin2d(_df['Sales'].to_numpy(), _df['Profit'].to_numpy(), bins)
+
+
+@st.fragment(run_every=LIVE_TICK_SECONDS)
+def live_stream():
+    # Each tick reads only the rows produced since this session's last tick
+    feed = get_live_feed()
+    new_rows, st.session_state.live_cursor = feed.since(st.session_state.get('live_cursor', feed.total))
+    stats = feed.stats
+    if not stats.count:
+        st.info("⏳ Waiting for the first rows from the stream...")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("💰 Streamed Sales", f"${amount(stats.totals['Sales'])}", delta=amount(stats.delta('Sales', delta_window)))
+    with col2:
+        st.metric("📈 Avg Profit", f"${stats.mean('Profit'):.0f}", delta=f"{stats.growth('Profit', trend_window):.1f}%")
+    with col3:
+        st.metric("👥 Customers", f"{amount(stats.totals['Customers'])}", delta=amount(stats.delta('Customers', delta_window)))
+    with col4:
+        st.metric("📊 Rows Streamed", f"{stats.count:,}", delta=f"{len(new_rows):,} new")
+
+    # The chart follows a fixed window of the latest rows, whatever the stream's length
+    st.line_chart(feed.tail(LIVE_WINDOW).set_index('Date')[['Sales', 'Profit']], height=300)
+
+def series_chart(chart, values, key):
+    # Time window slider, then either the raw points or an LTTB reduction of each series
+    start, end = df['Date'].iloc[0].to_pydatetime(), df['Date'].iloc[-1].to_pydatetime()
+    window = st.slider("Time window", min_value=start, max_value=end, value=(start, end),
+                       format="YYYY-MM-DD", key=f"{key}_window")
+    lo = int(np.searchsorted(dates, np.datetime64(window[0]), side='left'))
+    hi = int(np.searchsorted(dates, np.datetime64(window[1]), side='right'))
+    shown = hi - lo
+    raw = st.toggle("Show raw points", key=f"{key}_raw", disabled=shown > RAW_MAX_POINTS,
+                    help=f"Available once the window holds at most {RAW_MAX_POINTS:,} points")
+    if (raw and shown <= RAW_MAX_POINTS) or shown <= CHART_POINTS:
+        chart(pd.DataFrame({column: column_values[lo:hi] for column, column_values in values.items()},
+                           index=pd.Index(dates[lo:hi], name='Date')), height=400)
+    else:
+        keep = downsampled_rows(dataset_version, tuple(values), CHART_POINTS, (lo, hi), dates, values)
+        chart(pd.DataFrame({column: column_values[keep] for column, column_values in values.items()},
+                           index=pd.Index(dates[keep], name='Date')), height=400)
+        st.caption(f"{shown:,} points per series reduced to {len(keep):,} shared points with LTTB downsampling")
 
 # Key metrics
+stats = rolling_stats(dataset_version, df)
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     st.metric(
         label="💰 Total Sales",
-        value=f"${df['Sales'].sum():,}",
-        delta=f"{df['Sales'].iloc[-1] - df['Sales'].iloc[-2]:,}"
+        value=f"${amount(stats.totals['Sales'])}",
+        delta=amount(stats.delta('Sales', delta_window))
     )
 
 with col2:
     st.metric(
         label="📈 Avg Profit",
-        value=f"${df['Profit'].mean():.0f}",
-        delta=f"{((df['Profit'].iloc[-5:].mean() - df['Profit'].iloc[-10:-5].mean()) / df['Profit'].iloc[-10:-5].mean() * 100):.1f}%"
+        value=f"${stats.mean('Profit'):.0f}",
+        delta=f"{stats.growth('Profit', trend_window):.1f}%"
     )
 
 with col3:
     st.metric(
         label="👥 Total Customers",
-        value=f"{df['Customers'].sum():,}",
-        delta=f"{df['Customers'].iloc[-1] - df['Customers'].iloc[-2]}"
+        value=amount(stats.totals['Customers']),
+        delta=amount(stats.delta('Customers', delta_window))
     )
 
 with col4:
     st.metric(
         label="📊 Data Points",
-        value=len(df),
+        value=stats.count,
         delta="Live Data"
     )
 
 st.markdown("---")
 
-# Chart display based on selection
-if chart_type == "Line Chart" or chart_type == "All Charts":
+if live_mode:
+    st.markdown("### 📡 Live Sales Stream")
+    live_stream()
+    st.markdown("---")
+
+# Each section is a fragment: its own widgets rerun only that section, and the
+# data it derives is cached per dataset version
+@st.fragment
+def trend_section():
     st.markdown("### 📈 Sales Trend Over Time")
     
-    # Prepare data for line chart
-    chart_data = df.set_index('Date')[['Sales', 'Profit']]
-    st.line_chart(chart_data, height=400)
+    series_chart(st.line_chart, {'Sales': df['Sales'].to_numpy(), 'Profit': df['Profit'].to_numpy()}, "trend")
     
     # Additional insights
     col1, col2 = st.columns(2)
     with col1:
-        st.info(f"📈 Sales Growth: {((df['Sales'].iloc[-1] - df['Sales'].iloc[0]) / df['Sales'].iloc[0] * 100):.1f}%")
+        st.info(f"📈 Sales Growth: {stats.growth_since_first('Sales'):.1f}%")
     with col2:
-        st.info(f"💰 Profit Growth: {((df['Profit'].iloc[-1] - df['Profit'].iloc[0]) / df['Profit'].iloc[0] * 100):.1f}%")
+        st.info(f"💰 Profit Growth: {stats.growth_since_first('Profit'):.1f}%")
 
-if chart_type == "Bar Chart" or chart_type == "All Charts":
+@st.fragment
+def regional_section():
     st.markdown("### 📊 Regional Performance")
     
-    regional_data = df.groupby('Region').agg({
-        'Sales': 'sum',
-        'Profit': 'sum',
-        'Customers': 'sum'
-    }).reset_index()
+    regional_data = sales_cube(dataset_version, df).totals()
+    regional_data = regional_data[regional_data['Rows'] > 0].reset_index(drop=True)
     
     # Display regional data as bar chart
     st.bar_chart(regional_data.set_index('Region')['Sales'], height=400)
@@ -138,37 +313,51 @@ if chart_type == "Bar Chart" or chart_type == "All Charts":
     with col1:
         st.markdown("**Top Region by Sales:**")
         top_region = regional_data.loc[regional_data['Sales'].idxmax()]
-        st.success(f"{top_region['Region']}: ${top_region['Sales']:,}")
+        st.success(f"{top_region['Region']}: ${amount(top_region['Sales'])}")
     
     with col2:
         st.markdown("**Most Profitable Region:**")
         profit_region = regional_data.loc[regional_data['Profit'].idxmax()]
-        st.success(f"{profit_region['Region']}: ${profit_region['Profit']:,}")
+        st.success(f"{profit_region['Region']}: ${amount(profit_region['Profit'])}")
 
-if chart_type == "Area Chart" or chart_type == "All Charts":
+@st.fragment
+def cumulative_section():
     st.markdown("### 🌊 Cumulative Growth")
     
-    df_cumulative = df.copy()
-    df_cumulative['Cumulative_Sales'] = df_cumulative['Sales'].cumsum()
-    df_cumulative['Cumulative_Profit'] = df_cumulative['Profit'].cumsum()
-    
     # Area chart using Streamlit's built-in functionality
-    area_data = df_cumulative.set_index('Date')[['Cumulative_Sales', 'Cumulative_Profit']]
-    st.area_chart(area_data, height=400)
+    cumulative = cumulative_series(dataset_version, df)
+    series_chart(st.area_chart, cumulative, "cumulative")
     
     # Growth insights
-    total_growth = df_cumulative['Cumulative_Sales'].iloc[-1]
-    st.info(f"🚀 Total Cumulative Sales: ${total_growth:,}")
+    total_growth = cumulative['Cumulative_Sales'][-1]
+    st.info(f"🚀 Total Cumulative Sales: ${amount(total_growth)}")
 
-if chart_type == "Scatter Plot" or chart_type == "All Charts":
+@st.fragment
+def scatter_section():
     st.markdown("### 🎯 Sales vs Profit Analysis")
     
-    # Create scatter plot data
-    scatter_data = df[['Sales', 'Profit']].copy()
-    st.scatter_chart(scatter_data, x='Sales', y='Profit', height=400)
+    if len(df) > scatter_max_points:
+        # Too many points to draw one by one: show how many fall in each grid cell
+        st.vega_lite_chart(density_grid(dataset_version, density_bins, df), {
+            'mark': {'type': 'rect'},
+            'encoding': {
+                'x': {'field': 'x', 'type': 'quantitative', 'title': 'Sales'},
+                'x2': {'field': 'x2'},
+                'y': {'field': 'y', 'type': 'quantitative', 'title': 'Profit'},
+                'y2': {'field': 'y2'},
+                'color': {'field': 'count', 'type': 'quantitative', 'title': 'Points',
+                          'scale': {'scheme': 'viridis'}},
+                'tooltip': [{'field': 'count', 'type': 'quantitative', 'title': 'Points'}]
+            }
+        }, height=400, use_container_width=True)
+        st.caption(f"{len(df):,} points binned on a {density_bins}×{density_bins} grid")
+    else:
+        # Create scatter plot data
+        scatter_data = df[['Sales', 'Profit']]
+        st.scatter_chart(scatter_data, x='Sales', y='Profit', height=400)
     
     # Correlation analysis
-    correlation = df['Sales'].corr(df['Profit'])
+    correlation = sales_profit_correlation(dataset_version, df)
     if correlation > 0.7:
         st.success(f"📈 Strong positive correlation: {correlation:.2f}")
     elif correlation > 0.3:
@@ -179,75 +368,98 @@ if chart_type == "Scatter Plot" or chart_type == "All Charts":
     # Additional scatter insights
     col1, col2, col3 = st.columns(3)
     with col1:
-        avg_sales = df['Sales'].mean()
+        avg_sales = stats.mean('Sales')
         st.metric("Avg Sales", f"${avg_sales:.0f}")
     with col2:
-        avg_profit = df['Profit'].mean()
+        avg_profit = stats.mean('Profit')
         st.metric("Avg Profit", f"${avg_profit:.0f}")
     with col3:
-        profit_margin = (df['Profit'].sum() / df['Sales'].sum()) * 100
+        profit_margin = (stats.totals['Profit'] / stats.totals['Sales']) * 100
         st.metric("Profit Margin", f"{profit_margin:.1f}%")
 
-# Interactive data table
-st.markdown("---")
-st.markdown("### 📋 Interactive Data Table")
-
-# Add filters
-col1, col2 = st.columns(2)
-with col1:
-    region_filter = st.multiselect(
-        "Filter by Region",
-        options=df['Region'].unique(),
-        default=df['Region'].unique()
+@st.fragment
+def data_table_section():
+    st.markdown("### 📋 Interactive Data Table")
+    
+    engine = sales_filter(dataset_version, df)
+    regional_rows = sales_cube(dataset_version, df).totals()
+    present_regions = regional_rows.loc[regional_rows['Rows'] > 0, 'Region'].tolist()
+    sales_min, sales_max = engine.bounds()
+    
+    # Add filters
+    col1, col2 = st.columns(2)
+    with col1:
+        region_filter = st.multiselect(
+            "Filter by Region",
+            options=present_regions,
+            default=present_regions
+        )
+    
+    with col2:
+        sales_range = st.slider(
+            "Sales Range",
+            min_value=sales_min,
+            max_value=sales_max,
+            value=(sales_min, sales_max)
+        )
+    
+    # Apply filters
+    filtered_rows = engine.query(region_filter, *sales_range)
+    
+    # Display filtered data
+    if len(filtered_rows) > TABLE_ROWS:
+        st.caption(f"Showing the first {TABLE_ROWS:,} of {len(filtered_rows):,} rows; the download includes all of them.")
+    st.dataframe(
+        df.iloc[filtered_rows.head(TABLE_ROWS)],
+        column_config={
+            "Date": st.column_config.DateColumn("Date", format="DD/MM/YYYY"),
+            "Sales": st.column_config.NumberColumn("Sales ($)", format="$%d"),
+            "Profit": st.column_config.NumberColumn("Profit ($)", format="$%d"),
+            "Customers": st.column_config.NumberColumn("Customers", format="%d"),
+            "Region": st.column_config.TextColumn("Region")
+        },
+        use_container_width=True,
+        hide_index=True
     )
+    
+    # Download data option
+    st.markdown("---")
+    col1, col2, col3 = st.columns([1, 1, 1])
+    
+    with col2:
+        export_format = st.selectbox("Download format", list(EXPORT_FORMATS))
+        extension, mime = EXPORT_FORMATS[export_format]
+        # Built on click from the filtered rows, then reused while the data and filters stay the same
+        content_version = ("sales", *dataset_version, tuple(sorted(region_filter)), sales_range)
+        st.download_button(
+            label="📥 Download Data",
+            data=partial(cached_export, content_version, export_format,
+                         lambda: iter_frame_chunks(df.iloc[filtered_rows.positions()])),
+            file_name=f'sales_data_{datetime.now().strftime("%Y%m%d")}.{extension}',
+            mime=mime,
+            type="primary",
+            on_click="ignore"
+        )
 
-with col2:
-    sales_range = st.slider(
-        "Sales Range",
-        min_value=int(df['Sales'].min()),
-        max_value=int(df['Sales'].max()),
-        value=(int(df['Sales'].min()), int(df['Sales'].max()))
-    )
+# Chart display based on selection; only the selected sections run
+if chart_type == "Line Chart" or chart_type == "All Charts":
+    trend_section()
 
-# Apply filters
-filtered_df = df[
-    (df['Region'].isin(region_filter)) &
-    (df['Sales'] >= sales_range[0]) &
-    (df['Sales'] <= sales_range[1])
-]
-
-# Display filtered data
-st.dataframe(
-    filtered_df,
-    column_config={
-        "Date": st.column_config.DateColumn("Date", format="DD/MM/YYYY"),
-        "Sales": st.column_config.NumberColumn("Sales ($)", format="$%d"),
-        "Profit": st.column_config.NumberColumn("Profit ($)", format="$%d"),
-        "Customers": st.column_config.NumberColumn("Customers", format="%d"),
-        "Region": st.column_config.TextColumn("Region")
-    },
-    use_container_width=True,
-    hide_index=True
-)
+if chart_type == "Bar Chart" or chart_type == "All Charts":
+    regional_section()
 
-# Download data option
-st.markdown("---")
-col1, col2, col3 = st.columns([1, 1, 1])
+if chart_type == "Area Chart" or chart_type == "All Charts":
+    cumulative_section()
 
-with col2:
-    csv = filtered_df.to_csv(index=False)
-    st.download_button(
-        label="📥 Download Data as CSV",
-        data=csv,
-        file_name=f'sales_data_{datetime.now().strftime("%Y%m%d")}.csv',
-        mime='text/csv',
-        type="primary"
-    )
+if chart_type == "Scatter Plot" or chart_type == "All Charts":
+    scatter_section()
+
+# Interactive data table
+st.markdown("---")
+data_table_section()
 
-# Real-time simulation
-if st.sidebar.button("🔄 Refresh Data", type="primary"):
-    st.cache_data.clear()
-    st.rerun()
+# Real-time simulation: a fresh seed gives a new data set; the old one stays cached for other sessions
+st.sidebar.button("🔄 Refresh Data", type="primary", on_click=new_seed)
 
 st.sidebar.markdown("---")
 st.sidebar.info("💡 **Tip**: Use the controls above to customize your charts and explore different visualizations!")
\ No newline at end of file
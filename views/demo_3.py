@@ -6,6 +6,28 @@ import random
 from datetime import datetime, timedelta
 import json
 
+from utils.cache import cache_namespace
+from utils.data_art import ANIMATION_STYLES, ART_STYLES, COLOR_SCHEMES, render_animation, render_art
+from utils.monte_carlo import PERCENTILES, get_walk_pool, simulate_walks
+from utils.fractal import (COARSE_STEP, FRACTALS, HOME, JULIA_CONSTANTS, MAX_LEVEL, colorize,
+                           get_fractal_renderer, scale_at)
+
+# Point counts and image sizes offered by the raster renderer
+ART_POINT_OPTIONS = [10_000, 100_000, 500_000, 1_000_000, 2_000_000, 5_000_000]
+ART_RESOLUTIONS = {"640 × 480": (640, 480), "1024 × 768": (1024, 768), "1600 × 1200": (1600, 1200)}
+FRACTAL_ITERATIONS = [100, 200, 500, 1000, 2000]
+PAN_FRACTION = 0.25  # share of the view moved by one pan click
+WALK_COUNT_OPTIONS = [1_000, 10_000, 100_000, 1_000_000]
+WALK_STEP_OPTIONS = [100, 250, 500, 1_000, 2_000]
+ANIMATION_POINT_OPTIONS = [5_000, 10_000, 25_000, 50_000]
+ANIMATION_SIZE = (480, 360)
+ANIMATION_FPS = 10
+
+# Generated art and palettes are shared between sessions, keyed by their settings and seed
+art_cache = cache_namespace("art")
+ART_CACHE_BYTES = 64 * 1024 * 1024
+PALETTE_CACHE_BYTES = 1024 * 1024
+
 # Custom CSS for the creative playground
 st.markdown("""
 <style>
@@ -93,6 +115,8 @@ playground_mode = st.sidebar.selectbox(
     ["🎯 Number Guessing Game", "🎨 Color Palette Generator", "📊 Data Art Creator", 
      "🎵 Mood Music Matcher", "🔮 Fortune Teller", "🧮 Calculator Playground"]
 )
+# Filled in at the end of the run, once this run's lookups are counted
+cache_stats = st.sidebar.empty()
 
 # Initialize session state
 if 'game_score' not in st.session_state:
@@ -103,6 +127,19 @@ if 'attempts' not in st.session_state:
     st.session_state.attempts = 0
 if 'fortune_count' not in st.session_state:
     st.session_state.fortune_count = 0
+if 'fractal_views' not in st.session_state:
+    st.session_state.fractal_views = {}
+if 'art_seed' not in st.session_state:
+    st.session_state.art_seed = 42
+if 'palette_seed' not in st.session_state:
+    st.session_state.palette_seed = 42
+
+def new_seed(key):
+    st.session_state[key] = random.randint(0, 999_999)
+
+def _sync_seed(key):
+    # Copy a seed widget back into its persistent key, which survives runs that do not show it
+    st.session_state[key] = st.session_state[f"{key}_input"]
 
 # 🎯 Number Guessing Game
 if playground_mode == "🎯 Number Guessing Game":
@@ -153,11 +190,16 @@ elif playground_mode == "🎨 Color Palette Generator":
         num_colors = st.slider("Number of colors:", 3, 10, 5)
     
     with col2:
-        if st.button("🎨 Generate New Palette", type="primary"):
-            st.session_state.current_palette = True
+        st.button("🎨 Generate New Palette", type="primary", on_click=new_seed, args=("palette_seed",))
+        st.session_state.palette_seed_input = st.session_state.palette_seed
+        st.number_input("Seed:", min_value=0, step=1, key="palette_seed_input",
+                        on_change=_sync_seed, args=("palette_seed",))
+        palette_seed = st.session_state.palette_seed
     
     # Generate colors based on style
-    def generate_palette(style, count):
+    @art_cache.cached(max_bytes=PALETTE_CACHE_BYTES)
+    def generate_palette(mode, style, count, seed):
+        rng = random.Random(seed)
         colors = []
         if style == "Warm":
             base_hues = [0, 30, 60]  # Reds, oranges, yellows
@@ -174,21 +216,21 @@ elif playground_mode == "🎨 Color Palette Generator":
         
         for i in range(count):
             if style == "Pastel":
-                hue = random.choice(base_hues)
+                hue = rng.choice(base_hues)
                 color = f"hsl({hue}, 60%, 80%)"
             elif style == "Monochrome":
                 lightness = 20 + (i * 60 // count)
                 color = f"hsl(220, 50%, {lightness}%)"
             else:
-                hue = random.choice(base_hues) + random.randint(-20, 20)
-                saturation = random.randint(60, 90)
-                lightness = random.randint(40, 70)
+                hue = rng.choice(base_hues) + rng.randint(-20, 20)
+                saturation = rng.randint(60, 90)
+                lightness = rng.randint(40, 70)
                 color = f"hsl({hue}, {saturation}%, {lightness}%)"
             colors.append(color)
         return colors
     
     # Display palette
-    colors = generate_palette(palette_style, num_colors)
+    colors = generate_palette("palette", palette_style, num_colors, palette_seed)
     
     cols = st.columns(num_colors)
     for i, color in enumerate(colors):
@@ -209,58 +251,184 @@ elif playground_mode == "📊 Data Art Creator":
     col1, col2 = st.columns(2)
     
     with col1:
-        art_type = st.selectbox("Art Style:", ["Sine Wave Art", "Random Walk", "Spiral Pattern", "Fractal-like"])
-        complexity = st.slider("Complexity:", 10, 200, 50)
-        color_scheme = st.selectbox("Color Scheme:", ["Rainbow", "Ocean", "Sunset", "Forest"])
-    
+        art_type = st.selectbox("Art Style:", ART_STYLES)
+        fractal = None
+        if art_type == "Fractal-like":
+            fractal = st.radio("Fractal:", ["Perturbed points", *FRACTALS], horizontal=True)
+        if fractal in FRACTALS:
+            julia_c = st.selectbox("Julia constant c:", JULIA_CONSTANTS) if fractal == "Julia set" else None
+            max_iter = st.select_slider("Iterations:", FRACTAL_ITERATIONS, value=200)
+            resolution = st.selectbox("Resolution:", list(ART_RESOLUTIONS), index=1)
+        else:
+            renderings = ["Chart", "Raster image"] + (["Monte Carlo"] if art_type == "Random Walk" else [])
+            renderings += ["Animation"] if art_type in ANIMATION_STYLES else []
+            rendering = st.radio("Rendering:", renderings, horizontal=True,
+                                 help="Raster image draws millions of points into a single PNG; "
+                                      "Monte Carlo summarises many walks as percentile bands; "
+                                      "Animation plays a loop of precomputed frames")
+            if rendering == "Animation":
+                complexity = st.select_slider("Points per frame:", ANIMATION_POINT_OPTIONS, value=10_000,
+                                              format_func=lambda n: f"{n:,}")
+                resolution = None
+                playing = st.toggle("▶️ Play", value=True)
+            elif rendering == "Monte Carlo":
+                n_walks = st.select_slider("Walks:", WALK_COUNT_OPTIONS, value=10_000,
+                                           format_func=lambda n: f"{n:,}")
+                complexity = st.select_slider("Steps per walk:", WALK_STEP_OPTIONS, value=500)
+                use_workers = st.toggle("Use worker processes", value=False,
+                                        help="Spread chunks of walks over one process per CPU core")
+            elif rendering == "Chart":
+                complexity = st.slider("Complexity:", 10, 200, 50)
+                resolution = None
+            else:
+                complexity = st.select_slider("Points:", ART_POINT_OPTIONS, value=1_000_000,
+                                              format_func=lambda n: f"{n:,}")
+                resolution = st.selectbox("Resolution:", list(ART_RESOLUTIONS), index=1)
+        color_scheme = st.selectbox("Color Scheme:", list(COLOR_SCHEMES))
+        if fractal not in FRACTALS:
+            st.session_state.art_seed_input = st.session_state.art_seed
+            st.number_input("Seed:", min_value=0, step=1, key="art_seed_input", on_change=_sync_seed,
+                            args=("art_seed",), help="The same settings and seed always give the same art")
+            seed = st.session_state.art_seed
+            st.button("🎲 New Seed", on_click=new_seed, args=("art_seed",))
+
+    @art_cache.cached(max_bytes=ART_CACHE_BYTES)
+    def create_art(mode, style, complexity, color_scheme, seed, resolution=None):
+        # Chart data, or the PNG for raster mode
+        rng = np.random.default_rng(seed)
+        if mode == "Raster image":
+            width, height = ART_RESOLUTIONS[resolution]
+            return render_art(style, complexity, color_scheme, width, height, seed)
+        if mode == "Animation":
+            return render_animation(style, complexity, color_scheme, *ANIMATION_SIZE)
+
+        if style == "Sine Wave Art":
+            x = np.linspace(0, 4*np.pi, complexity)
+            y1 = np.sin(x) * np.cos(x/2)
+            y2 = np.cos(x) * np.sin(x/3)
+            y3 = np.sin(x*2) * 0.5
+            
+            art_data = pd.DataFrame({
+                'x': x,
+                'Wave 1': y1,
+                'Wave 2': y2,
+                'Wave 3': y3
+            })
+            return art_data.set_index('x')
+            
+        elif style == "Random Walk":
+            steps = rng.standard_normal(complexity).cumsum()
+            steps2 = rng.standard_normal(complexity).cumsum()
+            
+            walk_data = pd.DataFrame({
+                'Step': range(complexity),
+                'Walk 1': steps,
+                'Walk 2': steps2
+            })
+            return walk_data.set_index('Step')
+            
+        elif style == "Spiral Pattern":
+            t = np.linspace(0, 4*np.pi, complexity)
+            r = t
+            x = r * np.cos(t)
+            y = r * np.sin(t)
+            
+            return pd.DataFrame({'X': x, 'Y': y})
+            
+        else:  # Fractal-like
+            x = rng.standard_normal(complexity)
+            y = rng.standard_normal(complexity)
+            
+            # Apply some fractal-like transformations
+            for _ in range(3):
+                x = x + 0.1 * np.sin(y)
+                y = y + 0.1 * np.cos(x)
+            
+            return pd.DataFrame({'X': x, 'Y': y})
+
+    @st.fragment(run_every=1 / ANIMATION_FPS)
+    def play_animation(frames):
+        # A tick only swaps in a precomputed PNG. The frame follows the clock, so late ticks skip frames
+        # rather than slowing the loop down.
+        elapsed = time.monotonic() - st.session_state.setdefault("animation_start", time.monotonic())
+        st.image(frames[int(elapsed * ANIMATION_FPS) % len(frames)], output_format="PNG")
+
     with col2:
-        if st.button("🎨 Create Art", type="primary"):
-            # Generate artistic data
-            if art_type == "Sine Wave Art":
-                x = np.linspace(0, 4*np.pi, complexity)
-                y1 = np.sin(x) * np.cos(x/2)
-                y2 = np.cos(x) * np.sin(x/3)
-                y3 = np.sin(x*2) * 0.5
-                
-                art_data = pd.DataFrame({
-                    'x': x,
-                    'Wave 1': y1,
-                    'Wave 2': y2,
-                    'Wave 3': y3
-                })
-                st.line_chart(art_data.set_index('x'))
-                
-            elif art_type == "Random Walk":
-                steps = np.random.randn(complexity).cumsum()
-                steps2 = np.random.randn(complexity).cumsum()
-                
-                walk_data = pd.DataFrame({
-                    'Step': range(complexity),
-                    'Walk 1': steps,
-                    'Walk 2': steps2
+        if fractal in FRACTALS:
+            # Escape-time explorer: the view is kept per fractal and only moves on the grid of cached tiles
+            width, height = ART_RESOLUTIONS[resolution]
+            view = st.session_state.fractal_views.setdefault(fractal, {"center": HOME[fractal], "level": 0})
+
+            def move_view(view, dx=0, dy=0, zoom=0):
+                step = PAN_FRACTION * scale_at(view["level"])
+                view["center"] = (view["center"][0] + dx * step * width, view["center"][1] + dy * step * height)
+                view["level"] = min(max(view["level"] + zoom, 0), MAX_LEVEL)
+
+            def reset_view(view):
+                view.update(center=HOME[fractal], level=0)
+
+            controls = st.columns(7)
+            controls[0].button("⬅️", on_click=move_view, args=(view,), kwargs={"dx": -1}, help="Pan left")
+            controls[1].button("➡️", on_click=move_view, args=(view,), kwargs={"dx": 1}, help="Pan right")
+            controls[2].button("⬆️", on_click=move_view, args=(view,), kwargs={"dy": 1}, help="Pan up")
+            controls[3].button("⬇️", on_click=move_view, args=(view,), kwargs={"dy": -1}, help="Pan down")
+            controls[4].button("➕", on_click=move_view, args=(view,), kwargs={"zoom": 1}, help="Zoom in")
+            controls[5].button("➖", on_click=move_view, args=(view,), kwargs={"zoom": -1}, help="Zoom out")
+            controls[6].button("🏠", on_click=reset_view, args=(view,), help="Reset view")
+
+            renderer = get_fractal_renderer()
+            args = (fractal, julia_c, view["center"], view["level"], width, height, max_iter)
+            image = st.empty()
+            # Progressive refinement: a coarse preview first whenever full-resolution tiles are missing
+            if not renderer.is_cached(*args):
+                preview, _, _ = renderer.render(*args, step=COARSE_STEP)
+                image.image(colorize(preview, max_iter, color_scheme), caption="Preview, refining…")
+            escape_times, computed, total = renderer.render(*args)
+            image.image(colorize(escape_times, max_iter, color_scheme), output_format="PNG",
+                        caption=f"Zoom ×{2 ** view['level']:,} · {total - computed} of {total} tiles from cache")
+
+        elif rendering == "Animation":
+            # Every frame is rendered up front in one pass and cached, so playback does no drawing
+            frames = create_art(rendering, art_type, complexity, color_scheme, seed)
+            if playing:
+                play_animation(frames)
+            else:
+                st.image(frames[0], output_format="PNG")
+            st.caption(f"{len(frames)} frames · {complexity:,} points each · "
+                       f"{sum(map(len, frames)) / 1024:,.0f} KB in total")
+
+        elif st.button("🎨 Create Art", type="primary"):
+            if rendering == "Monte Carlo":
+                # Not cached: every run is timed so the throughput can be tracked
+                executor = get_walk_pool() if use_workers else None
+                bands, seconds = simulate_walks(n_walks, complexity, seed, executor)
+                st.metric("Throughput", f"{n_walks * complexity / seconds / 1e6:,.1f}M walk-steps/s",
+                          help=f"{n_walks:,} walks × {complexity:,} steps in {seconds:.2f}s")
+                outer, inner = (PERCENTILES[0], PERCENTILES[-1]), (PERCENTILES[1], PERCENTILES[2])
+                st.vega_lite_chart(bands, {
+                    "encoding": {"x": {"field": "Step", "type": "quantitative"}},
+                    "layer": [
+                        *[{"mark": {"type": "area", "opacity": opacity},
+                           "encoding": {"y": {"field": f"P{low}", "type": "quantitative", "title": "Position"},
+                                        "y2": {"field": f"P{high}"}}}
+                          for (low, high), opacity in [(outer, 0.25), (inner, 0.45)]],
+                        {"mark": {"type": "line", "color": "black"},
+                         "encoding": {"y": {"field": "Mean", "type": "quantitative"}}},
+                    ],
                 })
-                st.line_chart(walk_data.set_index('Step'))
-                
-            elif art_type == "Spiral Pattern":
-                t = np.linspace(0, 4*np.pi, complexity)
-                r = t
-                x = r * np.cos(t)
-                y = r * np.sin(t)
-                
-                spiral_data = pd.DataFrame({'X': x, 'Y': y})
-                st.scatter_chart(spiral_data, x='X', y='Y')
-                
-            else:  # Fractal-like
-                x = np.random.randn(complexity)
-                y = np.random.randn(complexity)
-                
-                # Apply some fractal-like transformations
-                for _ in range(3):
-                    x = x + 0.1 * np.sin(y)
-                    y = y + 0.1 * np.cos(x)
-                
-                fractal_data = pd.DataFrame({'X': x, 'Y': y})
-                st.scatter_chart(fractal_data, x='X', y='Y')
+                st.caption(f"Mean of {n_walks:,} walks with {inner[0]}–{inner[1]}% and "
+                           f"{outer[0]}–{outer[1]}% percentile bands")
+            else:
+                art = create_art(rendering, art_type, complexity, color_scheme, seed, resolution)
+                if rendering == "Raster image":
+                    # Only the finished PNG is sent, so its size depends on the resolution, not on the point count
+                    width, height = ART_RESOLUTIONS[resolution]
+                    st.image(art, output_format="PNG",
+                             caption=f"{complexity:,} points · {width}×{height} · {len(art) / 1024:,.0f} KB PNG")
+                elif art_type in ("Sine Wave Art", "Random Walk"):
+                    st.line_chart(art)
+                else:
+                    st.scatter_chart(art, x='X', y='Y')
 
 # 🎵 Mood Music Matcher
 elif playground_mode == "🎵 Mood Music Matcher":
@@ -449,4 +617,7 @@ st.markdown("""
     <p>🎨 <strong>Creative Playground</strong> - Where data meets imagination!</p>
     <p>Try different modes and discover new interactive experiences!</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+cache_stats.caption(f"🗃️ Art cache: {art_cache.hits:,} hits · {art_cache.misses:,} misses · "
+                    f"{len(art_cache)} entries · {art_cache.nbytes / 1024 ** 2:,.1f} MB")
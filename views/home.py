@@ -1,5 +1,4 @@
 import streamlit as st
-import time
 
 # Custom CSS for enhanced styling
 st.markdown("""
@@ -184,6 +183,5 @@ st.markdown("""
 # Footer with animated elements
 if st.button("🎉 Show Celebration", type="primary"):
     st.balloons()
-    st.success("Thanks for visiting our demo app! 🚀")
-    time.sleep(1)
+    st.toast("Thanks for visiting our demo app!", icon="🚀")
     st.snow()
\ No newline at end of file